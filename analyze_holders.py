@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 from sheets_integration import GoogleSheetsIntegration
 from birdeye_get_data import BirdeyeDataCollector
-import json
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -71,8 +71,8 @@ class HolderAnalyzer:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, params=params, headers=headers) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Wallet portfolio response: {data}")
+                        data = orjson.loads(await response.read())
+                        logger.debug("Wallet portfolio response: %s", data)
                         if data.get('success'):
                             portfolio_data = data['data']
                             
@@ -238,7 +238,9 @@ class HolderAnalyzer:
                         holder_data['tokens'].append(token_data)
 
                     logger.info(f"Posting analysis for holder #{idx} {wallet} to Google Sheets")
-                    logger.info(f"Holder data: {json.dumps(holder_data, indent=2)}")
+                    # Pretty-printing every holder's payload is only worth it when debugging
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Holder data: %s", orjson.dumps(holder_data, option=orjson.OPT_INDENT_2).decode())
                     
                     # Post the serializable data to Google Sheets
                     if self.sheets.post_holder_token_analysis(holder_data):
@@ -271,6 +273,8 @@ async def main():
         logger.error("Missing required environment variables")
         return
     
+    # Use the validated settings rather than get_default_sheets(), which prefers
+    # GOOGLE_SHEETS_CREDENTIALS_FILE/GOOGLE_SHEETS_SPREADSHEET_ID when they are set
     sheets = GoogleSheetsIntegration(credentials_file, spreadsheet_id)
     analyzer = HolderAnalyzer(birdeye_api_key, sheets)
     
@@ -5,9 +5,10 @@ from typing import Dict, List, Tuple
 import asyncio
 import json
 import aiohttp
+import orjson
 from dotenv import load_dotenv
 from birdeye_get_data import BirdeyeDataCollector
-from sheets_integration import GoogleSheetsIntegration
+from sheets_integration import GoogleSheetsIntegration, get_default_sheets
 import time
 
 # Load environment variables from .env file
@@ -155,8 +156,8 @@ class TokenAuditor:
                         logging.error(f"Claude API error: {response.status} - {await response.text()}")
                         return None
                     
-                    response_data = await response.json()
-                    logging.info(f"Claude API response: {response_data}")
+                    response_data = await response.json(loads=orjson.loads)
+                    logger.debug("Claude API response: %s", response_data)
                     
                     if "content" in response_data and len(response_data["content"]) > 0:
                         try:
@@ -358,10 +359,7 @@ async def main():
         birdeye = BirdeyeDataCollector(api_key=os.getenv('BIRDEYE_API_KEY'))
         
         # Initialize Google Sheets integration
-        sheets = GoogleSheetsIntegration(
-            credentials_file='service-account.json',
-            spreadsheet_id=os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID')
-        )
+        sheets = get_default_sheets()
         
         # Initialize auditor with sheets integration
         auditor = TokenAuditor(birdeye=birdeye, sheets=sheets)
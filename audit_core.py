@@ -0,0 +1,188 @@
+"""
+Shared token data helpers for the audit scripts.
+
+Fetches DexScreener pair data and Helius token metadata over a caller-owned
+aiohttp session, with retry/backoff on rate limits and short in-memory TTL
+caches, plus the simulated transaction analysis used by test_audit.py.
+"""
+
+import os
+import copy
+import logging
+import orjson
+import asyncio
+import time
+import random
+import functools
+
+logger = logging.getLogger(__name__)
+
+# In-memory response caches: token address -> (fetch time, data)
+TOKEN_DATA_TTL = 60  # Pair data moves quickly
+TOKEN_METADATA_TTL = 300  # Metadata is close to static
+_token_data_cache = {}
+_token_metadata_cache = {}
+
+# DexScreener pair fields that test_token reports on
+PAIR_FIELDS = (
+    "chainId", "dexId", "pairAddress", "pairCreatedAt", "priceUsd", "priceNative",
+    "volume", "liquidity", "priceChange", "txns", "info"
+)
+
+# Statuses worth retrying: rate limits and gateway errors
+RETRY_STATUSES = (429, 502, 503, 504)
+MAX_RETRIES = 5
+
+async def request_with_retry(session, method, url, **kwargs):
+    """Send a request, retrying rate limits and gateway errors with exponential backoff"""
+    for attempt in range(MAX_RETRIES):
+        response = await session.request(method, url, **kwargs)
+        if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES - 1:
+            return response
+            
+        # Honour Retry-After when the server sends it
+        retry_after = response.headers.get('Retry-After', '')
+        response.release()
+        if retry_after.isdigit():
+            delay = int(retry_after)
+        else:
+            delay = min(2 ** attempt, 30) + random.random()
+        logger.warning(f"Got {response.status} from {url.split('?')[0]}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+        await asyncio.sleep(delay)
+
+@functools.lru_cache(maxsize=None)
+def _helius_metadata_url():
+    """Build the Helius token-metadata URL once, or None without an API key"""
+    api_key = os.getenv("HELIUS_API_KEY")
+    if not api_key:
+        return None
+    return f"https://api.helius.xyz/v0/token-metadata?api-key={api_key}"
+
+def _get_cached(cache, token_address, ttl):
+    """Return a cached response if it is younger than ttl seconds"""
+    entry = cache.get(token_address)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+async def fetch_token_data(session, token_address):
+    """Fetch token data from DexScreener API"""
+    cached = _get_cached(_token_data_cache, token_address, TOKEN_DATA_TTL)
+    if cached is not None:
+        return cached
+        
+    try:
+        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+        async with await request_with_retry(session, 'GET', url) as response:
+            data = await response.json(loads=orjson.loads)
+        
+        if not data or "pairs" not in data or not data["pairs"]:
+            logger.error(f"No data found for token: {token_address}")
+            return None
+            
+        # Keep only the fields we use from the pair with the highest liquidity
+        best = None
+        best_liquidity = -1.0
+        for candidate in data["pairs"]:
+            liquidity = candidate.get("liquidity")
+            usd = float(liquidity.get("usd") or 0) if liquidity else 0.0
+            if usd > best_liquidity:
+                best, best_liquidity = candidate, usd
+        pair = {field: best[field] for field in PAIR_FIELDS if field in best}
+        _token_data_cache[token_address] = (time.monotonic(), pair)
+        return pair
+        
+    except Exception as e:
+        logger.error(f"Error fetching token data: {str(e)}")
+        return None
+
+async def fetch_token_metadata(session, token_address):
+    """Fetch token metadata from Helius API"""
+    cached = _get_cached(_token_metadata_cache, token_address, TOKEN_METADATA_TTL)
+    if cached is not None:
+        return cached
+        
+    try:
+        url = _helius_metadata_url()
+        if not url:
+            logger.error("HELIUS_API_KEY not found in environment variables")
+            return None
+
+        payload = {"mintAccounts": [token_address]}
+        async with await request_with_retry(session, 'POST', url, json=payload) as response:
+            if response.status != 200:
+                logger.error(f"Error fetching metadata: {response.status}")
+                return None
+                
+            data = await response.json(loads=orjson.loads)
+            
+        if not data or len(data) == 0:
+            return None
+            
+        # Log raw response for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw metadata response: %s", orjson.dumps(data[0], option=orjson.OPT_INDENT_2).decode())
+        _token_metadata_cache[token_address] = (time.monotonic(), data[0])
+        return data[0]
+        
+    except Exception as e:
+        logger.error(f"Error fetching token metadata: {str(e)}")
+        return None
+
+# Simulated transaction analysis; analyze_recent_transactions hands out copies
+SIMULATED_ANALYSIS = {
+    "transaction_count": 150,
+    "active_wallets": 75,
+    "trading_velocity": 10.0,  # 10 transactions per minute
+    "patterns": {
+        "swaps": 50,
+        "transfers": 30,
+        "large_transfers": 5,
+        "multi_transfers": 10,
+        "failed": 8,
+        "rapid_swaps": 15,
+        "wash_trades": 5,
+        "sandwich_attacks": 2,
+        "flash_loans": 3,
+        "high_slippage": 12,
+        "arbitrage": 8,
+        "bot_trades": 20
+    },
+    "suspicious_wallets": {
+        "wallet1": 15,
+        "wallet2": 12,
+        "wallet3": 10,
+        "wallet4": 8,
+        "wallet5": 7
+    },
+    "suspicious_pairs": {
+        "wallet1:wallet2": 8,
+        "wallet3:wallet4": 6,
+        "wallet2:wallet5": 5
+    },
+    "unusual_activity": [
+        {"type": "Large Swap", "amount": "$50,000.00", "wallet": "wallet1", "timestamp": 1643723400},
+        {"type": "Flash Loan", "amount": "$100,000.00", "wallet": "wallet2", "timestamp": 1643723500},
+        {"type": "High Slippage", "amount": "8.5%", "wallet": "wallet3", "timestamp": 1643723600},
+        {"type": "Sandwich Attack", "amount": "$25,000.00", "wallet": "wallet4", "timestamp": 1643723700},
+        {"type": "Rapid Swaps", "count": "10 in 1min", "wallet": "wallet5", "timestamp": 1643723800}
+    ],
+    "recent_transactions": [
+        {"type": "swap", "description": "Large swap", "wallet": "wallet1", "destination": "wallet2", "amount_usd": 50000, "timestamp": 1643723900, "successful": True},
+        {"type": "flash_loan", "description": "Flash loan", "wallet": "wallet2", "destination": "wallet2", "amount_usd": 100000, "timestamp": 1643724000, "successful": True},
+        {"type": "swap", "description": "High slippage swap", "wallet": "wallet3", "destination": "wallet4", "amount_usd": 10000, "timestamp": 1643724100, "successful": True},
+        {"type": "sandwich", "description": "Sandwich attack", "wallet": "wallet4", "destination": "wallet5", "amount_usd": 25000, "timestamp": 1643724200, "successful": True},
+        {"type": "rapid_swap", "description": "Bot trading", "wallet": "wallet5", "destination": "wallet1", "amount_usd": 5000, "timestamp": 1643724300, "successful": True}
+    ],
+    "pattern_summary": {
+        "bot_activity": 0.40,      # 40% of swaps are from bots
+        "wash_trading": 0.033,     # 3.3% of transactions are wash trades
+        "failed_ratio": 0.053,     # 5.3% of transactions failed
+        "large_trade_ratio": 0.053 # 5.3% are large trades or flash loans
+    }
+}
+
+def analyze_recent_transactions(token_address):
+    """Analyze recent transactions"""
+    # Simulated data; a deep copy so callers can't mutate the shared template
+    return copy.deepcopy(SIMULATED_ANALYSIS)
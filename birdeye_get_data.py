@@ -4,8 +4,9 @@ BirdEye Data Collection Module
 This module provides a comprehensive interface to the BirdEye API for collecting and analyzing token data on Solana.
 The BirdeyeDataCollector class contains the following key functions:
 
-1. __init__(api_key: str, sheets: GoogleSheetsIntegration = None)
+1. __init__(api_key: str, sheets: GoogleSheetsIntegration = None, session: aiohttp.ClientSession = None)
    - Initializes the data collector with API key and optional Google Sheets integration
+   - Reuses an injected aiohttp session so connections are pooled across requests
    - Sets up base URL and headers for API requests
 
 2. _make_request(endpoint: str, params: Dict = None)
@@ -70,19 +71,30 @@ import logging
 from typing import Dict, List
 import aiohttp
 from datetime import datetime
-import json
+import orjson
 import asyncio
-from sheets_integration import GoogleSheetsIntegration
+import contextlib
+from sheets_integration import GoogleSheetsIntegration, get_default_sheets
 import time
 import os
 
 logger = logging.getLogger(__name__)
 
+# Cap on how much of a JSON payload is written to the debug log
+MAX_DEBUG_BYTES = 8192
+
+def _log_json_debug(label: str, obj) -> None:
+    """Log an indented, truncated JSON dump of obj, serializing only when DEBUG is enabled."""
+    if logger.isEnabledFor(logging.DEBUG):
+        dumped = orjson.dumps(obj, option=orjson.OPT_INDENT_2)[:MAX_DEBUG_BYTES]
+        logger.debug("%s: %s", label, dumped.decode("utf-8", "replace"))
+
 class BirdeyeDataCollector:
     """Class to collect and process data from Birdeye API"""
     
-    def __init__(self, api_key: str = None, sheets: GoogleSheetsIntegration = None):
-        """Initialize the data collector with API key and Google Sheets integration."""
+    def __init__(self, api_key: str = None, sheets: GoogleSheetsIntegration = None,
+                 session: aiohttp.ClientSession = None):
+        """Initialize the data collector with API key, Google Sheets integration and optional shared HTTP session."""
         # Get API key from parameter or environment variable
         self.api_key = api_key or os.getenv("BIRDEYE_API_KEY")
         
@@ -100,6 +112,7 @@ class BirdeyeDataCollector:
         logger.info(f"Initialized BirdeyeDataCollector with API key length: {len(self.api_key)}")
         
         self.sheets = sheets
+        self.session = session
         self.base_url = "https://public-api.birdeye.so"
         self.headers = {
             "X-API-KEY": self.api_key,
@@ -116,6 +129,15 @@ class BirdeyeDataCollector:
             logger.error("API key in headers is empty")
             raise ValueError("API key in headers cannot be empty")
 
+    @contextlib.asynccontextmanager
+    async def _session_scope(self, **session_kwargs):
+        """Yield the shared session if one was injected, otherwise a short-lived one."""
+        if self.session is not None:
+            yield self.session
+        else:
+            async with aiohttp.ClientSession(**session_kwargs) as session:
+                yield session
+
     async def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Make a request to the Birdeye API with retry logic and exponential backoff."""
         url = f"{self.base_url}/{endpoint}"
@@ -125,7 +147,7 @@ class BirdeyeDataCollector:
         
         for attempt in range(max_retries):
             try:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with self._session_scope(timeout=timeout) as session:
                     # Log request details without exposing full API key
                     masked_headers = self.headers.copy()
                     if "X-API-KEY" in masked_headers:
@@ -133,8 +155,9 @@ class BirdeyeDataCollector:
                         masked_headers["X-API-KEY"] = f"{key[:4]}...{key[-4:]}" if len(key) > 8 else "***"
                     logger.info(f"Making request to {url} with headers: {masked_headers} and params: {params} (attempt {attempt + 1}/{max_retries})")
                     
-                    async with session.get(url, headers=self.headers, params=params) as response:
-                        response_text = await response.text()
+                    async with session.get(url, headers=self.headers, params=params, timeout=timeout) as response:
+                        # Keep the raw bytes; orjson parses them without a str decode
+                        response_body = await response.read()
                         
                         # Handle specific error cases
                         if response.status == 521:
@@ -145,7 +168,7 @@ class BirdeyeDataCollector:
                         elif response.status == 429:
                             logger.warning(f"Rate limit exceeded (attempt {attempt + 1}/{max_retries})")
                         elif response.status != 200:
-                            logger.error(f"Birdeye API error: Status {response.status} - {response_text}")
+                            logger.error(f"Birdeye API error: Status {response.status} - {response_body.decode('utf-8', 'replace')}")
                         
                         # Check content type
                         content_type = response.headers.get('content-type', '')
@@ -157,7 +180,7 @@ class BirdeyeDataCollector:
                         # Only process 200 responses
                         if response.status == 200:
                             try:
-                                data = json.loads(response_text)
+                                data = orjson.loads(response_body)
                                 # Validate response structure
                                 if not isinstance(data, dict):
                                     logger.error(f"Invalid response format. Expected dict, got {type(data)}")
@@ -166,7 +189,7 @@ class BirdeyeDataCollector:
                                 # Log success without full response content
                                 logger.info(f"Successfully received response from {endpoint}")
                                 return data
-                            except json.JSONDecodeError as e:
+                            except orjson.JSONDecodeError as e:
                                 logger.error(f"Failed to parse JSON response: {str(e)}")
                                 if attempt == max_retries - 1:
                                     return {"error": "json_parse", "message": f"Failed to parse response: {str(e)}"}
@@ -265,7 +288,7 @@ class BirdeyeDataCollector:
             logger.error(f"No token info found for {token_address}")
             return {}
             
-        logger.info(f"Raw token info: {json.dumps(token_info, indent=2)}")
+        _log_json_debug("Raw token info", token_info)
         
         # Helper function to safely get numeric values
         def safe_get(d: Dict, key: str, default: float = 0.0) -> float:
@@ -325,7 +348,7 @@ class BirdeyeDataCollector:
             "holders": int(safe_get(token_info, "holders", 0))
         }
         
-        logger.info(f"Processed token data: {json.dumps(token_data, indent=2)}")
+        _log_json_debug("Processed token data", token_data)
         return token_data
 
     async def get_top_traders(self, token_address: str, timeframe: str = "24h", limit: int = 10) -> List[Dict]:
@@ -793,10 +816,10 @@ class BirdeyeDataCollector:
             
         try:
             url = f"{self.base_url}/{endpoint}"
-            async with aiohttp.ClientSession() as session:
+            async with self._session_scope() as session:
                 async with session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         if data.get("success", False):
                             return data.get("data", {})
                     logger.error(f"Error getting wallet portfolio: {await response.text()}")
@@ -863,12 +886,7 @@ class BirdeyeDataCollector:
 async def main():
     """Main function to test the BirdeyeDataCollector class."""
     # Initialize Google Sheets integration
-    sheets = GoogleSheetsIntegration(
-        credentials_file='credentials.json',  # You'll need to get this from Google Cloud Console
-        token_file='token.json',
-        spreadsheet_id='YOUR_SPREADSHEET_ID'  # You'll need to create a sheet and get its ID
-    )
-    sheets.authenticate()
+    sheets = get_default_sheets()
     
     # Initialize collector with API key and sheets integration
     collector = BirdeyeDataCollector("YOUR_API_KEY", sheets)
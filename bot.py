@@ -891,8 +891,8 @@ def fetch_token_info(token_address):
 async def analyze_recent_transactions(token_address, minutes=5):
     """Analyze recent transactions for patterns and unusual activity."""
     try:
-        analyzer = TransactionAnalyzer()
-        return await analyzer.analyze_transactions(token_address, minutes)
+        async with TransactionAnalyzer() as analyzer:
+            return await analyzer.analyze_transactions(token_address, minutes)
     except Exception as e:
         print(f"Error analyzing transactions: {str(e)}")
         return None
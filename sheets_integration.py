@@ -1,15 +1,47 @@
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
 import os.path
 import json
+import functools
 from datetime import datetime
 import logging
 from typing import List, Dict
 from googleapiclient.errors import HttpError
+import orjson
 
 logger = logging.getLogger(__name__)
 
+class OrjsonModel(JsonModel):
+    """JsonModel that (de)serializes request and response bodies with orjson."""
+
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return orjson.dumps(body_value).decode()
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Like JsonModel, hand back non-JSON bodies as text instead of raising
+            if isinstance(content, bytes):
+                content = content.decode('utf-8')
+            return content
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
 class GoogleSheetsIntegration:
+    # Number of columns in the audit sheet (see _get_audit_headers)
+    AUDIT_COLUMN_COUNT = 22
+
+    # Fixed ranges for the holder analysis sheet
+    HOLDER_SHEET_NAME = "HolderAnalysis"
+    HOLDER_READ_RANGE = "HolderAnalysis!A:D"
+    HOLDER_HEADER_RANGE = "HolderAnalysis!A1:D1"
+
     def __init__(self, credentials_file: str, spreadsheet_id: str):
         """Initialize the Google Sheets integration.
         
@@ -45,9 +77,20 @@ class GoogleSheetsIntegration:
                     scopes=['https://www.googleapis.com/auth/spreadsheets']
                 )
             
-            self.service = build('sheets', 'v4', credentials=credentials)
+            # Use the discovery document bundled with google-api-python-client
+            # instead of fetching it over HTTPS on every start
+            self.service = build(
+                'sheets', 'v4',
+                credentials=credentials,
+                model=OrjsonModel(),
+                cache_discovery=False,
+                static_discovery=True
+            )
             logger.info("Successfully built Google Sheets service")
             self.sheet_name = "TradeData"  # Use a more descriptive sheet name
+            self._trade_header_range = f'{self.sheet_name}!A1:M1'
+            self._trade_append_range = f'{self.sheet_name}!A:M'
+            self._trade_first_column_range = f'{self.sheet_name}!A:A'
             self.authenticate()
             self._ensure_sheet_exists()
             logger.info("Successfully verified sheet exists")
@@ -69,7 +112,8 @@ class GoogleSheetsIntegration:
         try:
             # Try to get the sheet to see if it exists
             self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
             ).execute()
 
             # Add a new sheet if it doesn't exist
@@ -94,7 +138,7 @@ class GoogleSheetsIntegration:
                 ]
                 self.service.spreadsheets().values().update(
                     spreadsheetId=self.spreadsheet_id,
-                    range=f'{self.sheet_name}!A1:M1',
+                    range=self._trade_header_range,
                     valueInputOption='RAW',
                     body={'values': headers}
                 ).execute()
@@ -148,7 +192,8 @@ class GoogleSheetsIntegration:
         """Get sheet ID by name."""
         try:
             spreadsheet = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
             ).execute()
             
             for sheet in spreadsheet['sheets']:
@@ -217,7 +262,7 @@ class GoogleSheetsIntegration:
             }
             result = self.service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id,
-                range=f'{self.sheet_name}!A:M',  # Use the new sheet name
+                range=self._trade_append_range,
                 valueInputOption='RAW',
                 insertDataOption='INSERT_ROWS',
                 body=body
@@ -260,14 +305,11 @@ class GoogleSheetsIntegration:
                 ).execute()
                 logger.info(f"Headers update response: {json.dumps(headers_response, indent=2)}")
 
-            # If audit_results is already a list, use it directly
+            # Lists are pre-formatted rows, dictionaries still need formatting
             if isinstance(audit_results, list):
-                row = audit_results
-                logger.info("Using provided audit_results list directly")
+                row = self._audit_passthrough(audit_results)
             else:
-                # Otherwise format it as a dictionary
-                logger.info("Formatting audit_results dictionary into row")
-                row = self._format_audit_row(audit_results)
+                row = self._audit_dict_to_row(audit_results)
             
             logger.info(f"Prepared row data: {json.dumps(row, indent=2)}")
 
@@ -277,6 +319,7 @@ class GoogleSheetsIntegration:
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{sheet_name}!A:V",
                 valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
                 body={"values": [row]}
             ).execute()
             logger.info(f"Successfully appended audit results: {json.dumps(result, indent=2)}")
@@ -293,19 +336,17 @@ class GoogleSheetsIntegration:
             logger.error(f"Error appending audit results: {str(e)}", exc_info=True)
             raise
 
-    def _format_audit_row(self, audit_data: Dict) -> List:
+    def _audit_passthrough(self, audit_row: List) -> List:
+        """Validate an already formatted audit row for Google Sheets."""
+        if len(audit_row) != self.AUDIT_COLUMN_COUNT:
+            logger.error(f"Audit data list length ({len(audit_row)}) does not match headers length ({self.AUDIT_COLUMN_COUNT})")
+            return [""] * self.AUDIT_COLUMN_COUNT
+        return audit_row
+
+    def _audit_dict_to_row(self, audit_data: Dict) -> List:
         """Format audit results into a row for Google Sheets."""
         try:
             logger.info("Formatting data")
-            
-            # If audit_data is a list, convert it to a dict using headers as keys
-            if isinstance(audit_data, list):
-                headers = self._get_audit_headers()
-                if len(audit_data) == len(headers):
-                    return audit_data  # Data is already in correct format
-                else:
-                    logger.error(f"Audit data list length ({len(audit_data)}) does not match headers length ({len(headers)})")
-                    return [""] * len(headers)
 
             # Extract nested dictionaries
             st_momentum = audit_data.get("st_momentum", {})
@@ -355,7 +396,7 @@ class GoogleSheetsIntegration:
         except Exception as e:
             logger.error(f"Error formatting audit row: {str(e)}")
             # Return a row of empty values matching the number of headers
-            return [""] * len(self._get_audit_headers())
+            return [""] * self.AUDIT_COLUMN_COUNT
 
     def _get_audit_headers(self) -> List[str]:
         """Get headers for the audit sheet"""
@@ -390,7 +431,7 @@ class GoogleSheetsIntegration:
             # Get the last row
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{self.sheet_name}!A:A"
+                range=self._trade_first_column_range
             ).execute()
             
             last_row = len(result.get('values', [])) + 1
@@ -470,7 +511,7 @@ class GoogleSheetsIntegration:
 
     def post_holder_token_analysis(self, holder_data: Dict):
         """Post holder token analysis to Google Sheets."""
-        sheet_name = "HolderAnalysis"
+        sheet_name = self.HOLDER_SHEET_NAME
         
         if not holder_data:
             logger.error("Received empty holder_data")
@@ -481,16 +522,16 @@ class GoogleSheetsIntegration:
             logger.debug(f"Input holder data structure: {type(holder_data)}")
             logger.debug(f"Input holder data keys: {list(holder_data.keys())}")
             
-            # Ensure sheet exists with retry
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                if self.ensure_sheet_exists(sheet_name):
-                    break
-                logger.warning(f"Failed to ensure sheet exists, attempt {retry_count + 1} of {max_retries}")
-                retry_count += 1
-                if retry_count == max_retries:
-                    logger.error(f"Failed to ensure sheet {sheet_name} exists after {max_retries} attempts")
+            # Create the sheet, treating "already exists" as success
+            try:
+                self.service.spreadsheets().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'requests': [{'addSheet': {'properties': {'title': sheet_name}}}]}
+                ).execute()
+                logger.info(f"Created new sheet '{sheet_name}'")
+            except HttpError as e:
+                if e.resp.status != 400 or b'already exists' not in e.content:
+                    logger.error(f"Failed to ensure sheet {sheet_name} exists: {e.resp.status} {e.resp.reason}")
                     return False
                 
             formatted_row = self._format_holder_data(holder_data)
@@ -504,7 +545,7 @@ class GoogleSheetsIntegration:
             try:
                 result = self.service.spreadsheets().values().get(
                     spreadsheetId=self.spreadsheet_id,
-                    range=f'{sheet_name}!A:D'
+                    range=self.HOLDER_READ_RANGE
                 ).execute()
                 
                 values = result.get('values', [])
@@ -518,7 +559,7 @@ class GoogleSheetsIntegration:
                     try:
                         header_result = self.service.spreadsheets().values().update(
                             spreadsheetId=self.spreadsheet_id,
-                            range=f'{sheet_name}!A1:D1',
+                            range=self.HOLDER_HEADER_RANGE,
                             valueInputOption='RAW',
                             body={'values': [headers]}
                         ).execute()
@@ -610,3 +651,18 @@ class GoogleSheetsIntegration:
         except Exception as e:
             logger.error(f"Error in post_holder_token_analysis: {str(e)}")
             return False
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_sheets() -> GoogleSheetsIntegration:
+    """Get the process-wide Google Sheets integration.
+
+    The instance is created on first use from the environment and reused
+    afterwards, so credentials and the discovery document are only loaded
+    once per process. The underlying HTTP transport is not thread-safe;
+    code issuing requests from several threads should create its own
+    GoogleSheetsIntegration instead.
+    """
+    credentials_file = os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE') or os.getenv('GOOGLE_CREDENTIALS_FILE', 'service-account.json')
+    spreadsheet_id = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID') or os.getenv('SPREADSHEET_ID')
+    return GoogleSheetsIntegration(credentials_file, spreadsheet_id)
@@ -1,8 +1,17 @@
 import os
+import sys
 import logging
-import requests
-import json
+import orjson
+import asyncio
+import aiohttp
+import functools
 from datetime import datetime
+from audit_core import (
+    request_with_retry,
+    fetch_token_data,
+    fetch_token_metadata,
+    analyze_recent_transactions
+)
 
 # Configure logging
 logging.basicConfig(
@@ -10,295 +19,229 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Set Helius API key for testing
-os.environ["HELIUS_API_KEY"] = "ba737b72-acf1-4d55-a893-20fdaf294be9"
-
-def fetch_token_data(token_address):
-    """Fetch token data from DexScreener API"""
-    try:
-        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-        response = requests.get(url)
-        data = response.json()
-        
-        if not data or "pairs" not in data or not data["pairs"]:
-            logging.error(f"No data found for token: {token_address}")
-            return None
-            
-        # Get the pair with the highest liquidity
-        pairs = data["pairs"]
-        pairs.sort(key=lambda x: float(x.get("liquidity", {}).get("usd", 0)), reverse=True)
-        return pairs[0]
-        
-    except Exception as e:
-        logging.error(f"Error fetching token data: {str(e)}")
-        return None
-
-def fetch_token_metadata(token_address):
-    """Fetch token metadata from Helius API"""
+def _fget(data, *keys, default=0.0):
+    """Walk nested dict keys and return the value as a float, or default"""
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
     try:
-        HELIUS_API_KEY = os.getenv("HELIUS_API_KEY")
-        if not HELIUS_API_KEY:
-            logging.error("HELIUS_API_KEY not found in environment variables")
-            return None
-
-        url = f"https://api.helius.xyz/v0/token-metadata?api-key={HELIUS_API_KEY}"
-        payload = {"mintAccounts": [token_address]}
-        response = requests.post(url, json=payload)
-        
-        if response.status_code != 200:
-            logging.error(f"Error fetching metadata: {response.status_code}")
-            return None
-            
-        data = response.json()
-        if not data or len(data) == 0:
-            return None
-            
-        # Log raw response for debugging
-        logging.debug(f"Raw metadata response: {json.dumps(data[0], indent=2)}")
-        return data[0]
-        
-    except Exception as e:
-        logging.error(f"Error fetching token metadata: {str(e)}")
-        return None
+        return float(data) if data is not None else default
+    except (TypeError, ValueError):
+        return default
 
-def analyze_recent_transactions(token_address):
-    """Analyze recent transactions"""
-    try:
-        # Simulate transaction analysis with more patterns
-        analysis = {
-            "transaction_count": 150,
-            "active_wallets": 75,
-            "trading_velocity": 10.0,  # 10 transactions per minute
-            "patterns": {
-                "swaps": 50,
-                "transfers": 30,
-                "large_transfers": 5,
-                "multi_transfers": 10,
-                "failed": 8,
-                "rapid_swaps": 15,
-                "wash_trades": 5,
-                "sandwich_attacks": 2,
-                "flash_loans": 3,
-                "high_slippage": 12,
-                "arbitrage": 8,
-                "bot_trades": 20
-            },
-            "suspicious_wallets": {
-                "wallet1": 15,
-                "wallet2": 12,
-                "wallet3": 10,
-                "wallet4": 8,
-                "wallet5": 7
-            },
-            "suspicious_pairs": {
-                "wallet1:wallet2": 8,
-                "wallet3:wallet4": 6,
-                "wallet2:wallet5": 5
-            },
-            "unusual_activity": [
-                {"type": "Large Swap", "amount": "$50,000.00", "wallet": "wallet1", "timestamp": 1643723400},
-                {"type": "Flash Loan", "amount": "$100,000.00", "wallet": "wallet2", "timestamp": 1643723500},
-                {"type": "High Slippage", "amount": "8.5%", "wallet": "wallet3", "timestamp": 1643723600},
-                {"type": "Sandwich Attack", "amount": "$25,000.00", "wallet": "wallet4", "timestamp": 1643723700},
-                {"type": "Rapid Swaps", "count": "10 in 1min", "wallet": "wallet5", "timestamp": 1643723800}
-            ],
-            "recent_transactions": [
-                {"type": "swap", "description": "Large swap", "wallet": "wallet1", "destination": "wallet2", "amount_usd": 50000, "timestamp": 1643723900, "successful": True},
-                {"type": "flash_loan", "description": "Flash loan", "wallet": "wallet2", "destination": "wallet2", "amount_usd": 100000, "timestamp": 1643724000, "successful": True},
-                {"type": "swap", "description": "High slippage swap", "wallet": "wallet3", "destination": "wallet4", "amount_usd": 10000, "timestamp": 1643724100, "successful": True},
-                {"type": "sandwich", "description": "Sandwich attack", "wallet": "wallet4", "destination": "wallet5", "amount_usd": 25000, "timestamp": 1643724200, "successful": True},
-                {"type": "rapid_swap", "description": "Bot trading", "wallet": "wallet5", "destination": "wallet1", "amount_usd": 5000, "timestamp": 1643724300, "successful": True}
-            ],
-            "pattern_summary": {
-                "bot_activity": 0.40,      # 40% of swaps are from bots
-                "wash_trading": 0.033,     # 3.3% of transactions are wash trades
-                "failed_ratio": 0.053,     # 5.3% of transactions failed
-                "large_trade_ratio": 0.053 # 5.3% are large trades or flash loans
-            }
-        }
-        return analysis
-        
-    except Exception as e:
-        logging.error(f"Error analyzing transactions: {str(e)}")
-        return None
+@functools.lru_cache(maxsize=1024)
+def _format_timestamp(timestamp):
+    """Format a unix timestamp for display"""
+    return datetime.fromtimestamp(timestamp).isoformat(sep=' ', timespec='seconds')
 
-def test_token(token_address):
+async def test_token(session, token_address):
     """Test comprehensive token data fetching"""
-    print("\n=== Testing Token Data Fetching ===")
-    print(f"Token: {token_address}")
+    out = []
+    emit = out.append
+    emit("\n=== Testing Token Data Fetching ===")
+    emit(f"Token: {token_address}")
+    
+    # Helius and DexScreener are independent, fetch both at once
+    helius_data, dex_data = await asyncio.gather(
+        fetch_token_metadata(session, token_address),
+        fetch_token_data(session, token_address)
+    )
     
     # 1. Test Helius Data
-    print("\n--- Helius Data ---")
-    helius_data = fetch_token_metadata(token_address)
+    emit("\n--- Helius Data ---")
     if helius_data:
-        print("\nBasic Token Info:")
-        print(f"• Name: {helius_data.get('name')}")
-        print(f"• Symbol: {helius_data.get('symbol')}")
-        print(f"• Description: {helius_data.get('description')}")
-        print(f"• Decimals: {helius_data.get('decimals')}")
-        print(f"• Supply: {float(helius_data.get('supply', 0))/(10**helius_data.get('decimals', 0)) if helius_data.get('supply') and helius_data.get('decimals') else 0:,.0f}")
+        emit("\nBasic Token Info:")
+        emit(f"• Name: {helius_data.get('name')}")
+        emit(f"• Symbol: {helius_data.get('symbol')}")
+        emit(f"• Description: {helius_data.get('description')}")
+        emit(f"• Decimals: {helius_data.get('decimals')}")
+        emit(f"• Supply: {float(helius_data.get('supply', 0))/(10**helius_data.get('decimals', 0)) if helius_data.get('supply') and helius_data.get('decimals') else 0:,.0f}")
         
-        print("\nToken Standard:")
-        print(f"• Standard: {helius_data.get('token_standard')}")
+        emit("\nToken Standard:")
+        emit(f"• Standard: {helius_data.get('token_standard')}")
         
-        print("\nAuthority Info:")
-        print(f"• Mint Authority: {helius_data.get('mintAuthority')}")
-        print(f"• Freeze Authority: {helius_data.get('freezeAuthority')}")
+        emit("\nAuthority Info:")
+        emit(f"• Mint Authority: {helius_data.get('mintAuthority')}")
+        emit(f"• Freeze Authority: {helius_data.get('freezeAuthority')}")
         
-        print("\nHolder Info:")
-        print(f"• Total Holders: {helius_data.get('holder_count', 0):,}")
+        emit("\nHolder Info:")
+        emit(f"• Total Holders: {helius_data.get('holder_count', 0):,}")
         
-        print("\nCreator Info:")
+        emit("\nCreator Info:")
         creators = helius_data.get('creators', [])
         if creators:
             for idx, creator in enumerate(creators, 1):
-                print(f"• Creator {idx}:")
-                print(f"  - Address: {creator.get('address')}")
-                print(f"  - Share: {creator.get('share')}%")
-                print(f"  - Verified: {creator.get('verified', False)}")
+                emit(f"• Creator {idx}:")
+                emit(f"  - Address: {creator.get('address')}")
+                emit(f"  - Share: {creator.get('share')}%")
+                emit(f"  - Verified: {creator.get('verified', False)}")
         
-        print("\nRoyalties:")
-        print(f"• Percentage: {helius_data.get('royalties')}%")
+        emit("\nRoyalties:")
+        emit(f"• Percentage: {helius_data.get('royalties')}%")
         
-        print("\nCollection:")
-        print(f"• Collection: {helius_data.get('collection')}")
+        emit("\nCollection:")
+        emit(f"• Collection: {helius_data.get('collection')}")
         
-        print("\nExternal Links:")
-        print(f"• Image: {helius_data.get('image')}")
-        print(f"• Website: {helius_data.get('external_url')}")
+        emit("\nExternal Links:")
+        emit(f"• Image: {helius_data.get('image')}")
+        emit(f"• Website: {helius_data.get('external_url')}")
         
-        print("\nAttributes:")
+        emit("\nAttributes:")
         attributes = helius_data.get('attributes', [])
         if attributes:
             for attr in attributes:
-                print(f"• {attr.get('trait_type')}: {attr.get('value')}")
+                emit(f"• {attr.get('trait_type')}: {attr.get('value')}")
     else:
-        print("Failed to fetch Helius data")
+        emit("Failed to fetch Helius data")
     
     # 2. Test DexScreener Data
-    print("\n--- DexScreener Data ---")
-    dex_data = fetch_token_data(token_address)
+    emit("\n--- DexScreener Data ---")
     if dex_data:
-        print("\nBasic Pair Info:")
-        print(f"• Chain ID: {dex_data.get('chainId')}")
-        print(f"• DEX ID: {dex_data.get('dexId')}")
-        print(f"• Pair Address: {dex_data.get('pairAddress')}")
-        print(f"• Pair Created At: {datetime.fromtimestamp(int(dex_data.get('pairCreatedAt', 0)/1000)).strftime('%Y-%m-%d %H:%M:%S')}")
+        emit("\nBasic Pair Info:")
+        emit(f"• Chain ID: {dex_data.get('chainId')}")
+        emit(f"• DEX ID: {dex_data.get('dexId')}")
+        emit(f"• Pair Address: {dex_data.get('pairAddress')}")
+        emit(f"• Pair Created At: {_format_timestamp(int(dex_data.get('pairCreatedAt', 0)/1000))}")
         
-        print("\nPrice Info:")
-        print(f"• Price USD: ${float(dex_data.get('priceUsd', 0)):.6f}")
-        print(f"• Price Native: {dex_data.get('priceNative')}")
+        emit("\nPrice Info:")
+        emit(f"• Price USD: ${_fget(dex_data, 'priceUsd'):.6f}")
+        emit(f"• Price Native: {dex_data.get('priceNative')}")
         
-        print("\nVolume Info:")
-        volume = dex_data.get('volume', {})
-        print(f"• Volume 24h: ${float(volume.get('h24', 0)):,.2f}")
-        print(f"• Volume 5m: ${float(volume.get('m5', 0)):,.2f}")
-        print(f"• Volume 1h: ${float(volume.get('h1', 0)):,.2f}")
+        emit("\nVolume Info:")
+        emit(f"• Volume 24h: ${_fget(dex_data, 'volume', 'h24'):,.2f}")
+        emit(f"• Volume 5m: ${_fget(dex_data, 'volume', 'm5'):,.2f}")
+        emit(f"• Volume 1h: ${_fget(dex_data, 'volume', 'h1'):,.2f}")
         
-        print("\nLiquidity Info:")
-        liquidity = dex_data.get('liquidity', {})
-        print(f"• Liquidity USD: ${float(liquidity.get('usd', 0)):,.2f}")
-        print(f"• Liquidity Base: {liquidity.get('base')}")
-        print(f"• Liquidity Quote: {liquidity.get('quote')}")
+        emit("\nLiquidity Info:")
+        liquidity = dex_data.get('liquidity') or {}
+        emit(f"• Liquidity USD: ${_fget(liquidity, 'usd'):,.2f}")
+        emit(f"• Liquidity Base: {liquidity.get('base')}")
+        emit(f"• Liquidity Quote: {liquidity.get('quote')}")
         
-        print("\nPrice Changes:")
-        price_change = dex_data.get('priceChange', {})
-        print(f"• 5m: {price_change.get('m5', 0):+.2f}%")
-        print(f"• 1h: {price_change.get('h1', 0):+.2f}%")
-        print(f"• 6h: {price_change.get('h6', 0):+.2f}%")
-        print(f"• 24h: {price_change.get('h24', 0):+.2f}%")
-        print(f"• 7d: {price_change.get('d7', 0):+.2f}%")
+        emit("\nPrice Changes:")
+        emit(f"• 5m: {_fget(dex_data, 'priceChange', 'm5'):+.2f}%")
+        emit(f"• 1h: {_fget(dex_data, 'priceChange', 'h1'):+.2f}%")
+        emit(f"• 6h: {_fget(dex_data, 'priceChange', 'h6'):+.2f}%")
+        emit(f"• 24h: {_fget(dex_data, 'priceChange', 'h24'):+.2f}%")
+        emit(f"• 7d: {_fget(dex_data, 'priceChange', 'd7'):+.2f}%")
         
-        print("\nTransaction Counts:")
+        emit("\nTransaction Counts:")
         txns = dex_data.get('txns', {})
         h24 = txns.get('h24', {})
         h1 = txns.get('h1', {})
-        print(f"• 24h Buys: {h24.get('buys', 0)}")
-        print(f"• 24h Sells: {h24.get('sells', 0)}")
-        print(f"• 1h Buys: {h1.get('buys', 0)}")
-        print(f"• 1h Sells: {h1.get('sells', 0)}")
+        emit(f"• 24h Buys: {h24.get('buys', 0)}")
+        emit(f"• 24h Sells: {h24.get('sells', 0)}")
+        emit(f"• 1h Buys: {h1.get('buys', 0)}")
+        emit(f"• 1h Sells: {h1.get('sells', 0)}")
         
-        print("\nSocial Links:")
+        emit("\nSocial Links:")
         info = dex_data.get('info', {})
         for social in info.get('socials', []):
-            print(f"• {social.get('type')}: {social.get('url')}")
+            emit(f"• {social.get('type')}: {social.get('url')}")
             
-        print("\nWebsites:")
+        emit("\nWebsites:")
         for website in info.get('websites', []):
-            print(f"• {website.get('url')}")
+            emit(f"• {website.get('url')}")
     else:
-        print("Failed to fetch DexScreener data")
+        emit("Failed to fetch DexScreener data")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def test_transactions(token_address):
     """Test transaction analysis"""
-    print("\n=== Testing Transaction Analysis ===")
-    print(f"Token: {token_address}\n")
+    out = []
+    emit = out.append
+    emit("\n=== Testing Transaction Analysis ===")
+    emit(f"Token: {token_address}\n")
     
     analysis = analyze_recent_transactions(token_address)
     if not analysis:
-        print("❌ Failed to analyze transactions")
+        emit("❌ Failed to analyze transactions")
+        sys.stdout.write("\n".join(out) + "\n")
         return
         
-    print("--- Transaction Overview ---")
-    print(f"Total Transactions: {analysis['transaction_count']}")
-    print(f"Active Wallets: {analysis['active_wallets']}")
-    print(f"Trading Velocity: {analysis['trading_velocity']:.1f} tx/min\n")
+    emit("--- Transaction Overview ---")
+    emit(f"Total Transactions: {analysis['transaction_count']}")
+    emit(f"Active Wallets: {analysis['active_wallets']}")
+    emit(f"Trading Velocity: {analysis['trading_velocity']:.1f} tx/min\n")
     
-    print("--- Transaction Patterns ---")
+    emit("--- Transaction Patterns ---")
     patterns = analysis['patterns']
-    print(f"Basic Patterns:")
-    print(f"• Swaps: {patterns['swaps']}")
-    print(f"• Transfers: {patterns['transfers']}")
-    print(f"• Failed Transactions: {patterns['failed']}\n")
+    emit(f"Basic Patterns:")
+    emit(f"• Swaps: {patterns['swaps']}")
+    emit(f"• Transfers: {patterns['transfers']}")
+    emit(f"• Failed Transactions: {patterns['failed']}\n")
     
-    print(f"Advanced Patterns:")
-    print(f"• Rapid Swaps: {patterns['rapid_swaps']}")
-    print(f"• Bot Trades: {patterns['bot_trades']}")
-    print(f"• Wash Trades: {patterns['wash_trades']}")
-    print(f"• Sandwich Attacks: {patterns['sandwich_attacks']}")
-    print(f"• Flash Loans: {patterns['flash_loans']}")
-    print(f"• High Slippage: {patterns['high_slippage']}")
-    print(f"• Arbitrage: {patterns['arbitrage']}\n")
+    emit(f"Advanced Patterns:")
+    emit(f"• Rapid Swaps: {patterns['rapid_swaps']}")
+    emit(f"• Bot Trades: {patterns['bot_trades']}")
+    emit(f"• Wash Trades: {patterns['wash_trades']}")
+    emit(f"• Sandwich Attacks: {patterns['sandwich_attacks']}")
+    emit(f"• Flash Loans: {patterns['flash_loans']}")
+    emit(f"• High Slippage: {patterns['high_slippage']}")
+    emit(f"• Arbitrage: {patterns['arbitrage']}\n")
     
-    print("--- Risk Metrics ---")
+    emit("--- Risk Metrics ---")
     summary = analysis['pattern_summary']
-    print(f"• Bot Activity: {summary['bot_activity']*100:.1f}%")
-    print(f"• Wash Trading: {summary['wash_trading']*100:.1f}%")
-    print(f"• Failed Transaction Ratio: {summary['failed_ratio']*100:.1f}%")
-    print(f"• Large Trade Ratio: {summary['large_trade_ratio']*100:.1f}%\n")
+    emit(f"• Bot Activity: {summary['bot_activity']*100:.1f}%")
+    emit(f"• Wash Trading: {summary['wash_trading']*100:.1f}%")
+    emit(f"• Failed Transaction Ratio: {summary['failed_ratio']*100:.1f}%")
+    emit(f"• Large Trade Ratio: {summary['large_trade_ratio']*100:.1f}%\n")
     
     if analysis['suspicious_wallets']:
-        print("--- Suspicious Wallets ---")
+        emit("--- Suspicious Wallets ---")
         for wallet, count in analysis['suspicious_wallets'].items():
-            print(f"• {wallet[:8]}...{wallet[-4:]}: {count} transactions")
-        print()
+            emit(f"• {wallet[:8]}...{wallet[-4:]}: {count} transactions")
+        emit("")
         
     if analysis['suspicious_pairs']:
-        print("--- Suspicious Trading Pairs ---")
+        emit("--- Suspicious Trading Pairs ---")
         for pair, count in analysis['suspicious_pairs'].items():
             w1, w2 = pair.split(":")
-            print(f"• {w1[:6]}.. ↔️ {w2[-6:]}: {count} interactions")
-        print()
+            emit(f"• {w1[:6]}.. ↔️ {w2[-6:]}: {count} interactions")
+        emit("")
         
     if analysis['unusual_activity']:
-        print("--- Unusual Activity ---")
+        emit("--- Unusual Activity ---")
         for activity in analysis['unusual_activity']:
-            print(f"• {activity['type']}: {activity.get('amount') or activity.get('fee')}")
-            print(f"  Wallet: {activity['wallet'][:8]}...{activity['wallet'][-4:]}")
-            print(f"  Time: {datetime.fromtimestamp(activity['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
-            print()
+            wallet = activity['wallet']
+            emit(f"• {activity['type']}: {activity.get('amount') or activity.get('fee')}")
+            emit(f"  Wallet: {wallet[:8]}...{wallet[-4:]}")
+            emit(f"  Time: {_format_timestamp(activity['timestamp'])}")
+            emit("")
             
-    print("--- Recent Transactions ---")
+    emit("--- Recent Transactions ---")
     for tx in analysis['recent_transactions']:
-        print(f"• Type: {tx['type']}")
-        print(f"  Description: {tx['description']}")
-        print(f"  From: {tx['wallet'][:8]}...{tx['wallet'][-4:]}")
-        print(f"  To: {tx['destination'][:8]}...{tx['destination'][-4:]}")
-        print(f"  Amount: ${tx['amount_usd']:,.2f}")
-        print(f"  Time: {datetime.fromtimestamp(tx['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Status: {'✅' if tx['successful'] else '❌'}\n")
+        source, destination = tx['wallet'], tx['destination']
+        short_from = f"{source[:8]}...{source[-4:]}"
+        short_to = f"{destination[:8]}...{destination[-4:]}"
+        emit(f"• Type: {tx['type']}")
+        emit(f"  Description: {tx['description']}")
+        emit(f"  From: {short_from}")
+        emit(f"  To: {short_to}")
+        emit(f"  Amount: ${tx['amount_usd']:,.2f}")
+        emit(f"  Time: {_format_timestamp(tx['timestamp'])}")
+        emit(f"  Status: {'✅' if tx['successful'] else '❌'}\n")
+    
+    sys.stdout.write("\n".join(out) + "\n")
+
+async def _probe_endpoint(session, endpoint):
+    """Call a single Helius endpoint and return its status, body or error"""
+    try:
+        response = await request_with_retry(
+            session, endpoint['method'], endpoint['url'], json=endpoint.get('payload')
+        )
+        async with response:
+            if response.status == 200:
+                data = await response.json(loads=orjson.loads)
+            else:
+                data = await response.text()
+            return {'status': response.status, 'data': data, 'error': None}
+    except Exception as e:
+        return {'status': None, 'data': None, 'error': str(e)}
 
-def test_helius_api(token_address):
+async def test_helius_api(session, token_address):
     """Test different Helius API endpoints to find the correct one"""
     HELIUS_API_KEY = os.getenv("HELIUS_API_KEY")
     if not HELIUS_API_KEY:
@@ -344,39 +287,60 @@ def test_helius_api(token_address):
     ]
     
     print("\n=== Testing Helius API Endpoints ===")
-    for endpoint in endpoints:
+    # Probe all endpoints concurrently, then report in order
+    results = await asyncio.gather(
+        *(_probe_endpoint(session, endpoint) for endpoint in endpoints)
+    )
+    for endpoint, result in zip(endpoints, results):
         print(f"\nTesting {endpoint['name']}...")
         print(f"URL: {endpoint['url']}")
         print(f"Method: {endpoint['method']}")
+        if endpoint['method'] == 'POST':
+            print(f"Payload: {orjson.dumps(endpoint['payload'], option=orjson.OPT_INDENT_2).decode()}")
         
-        try:
-            if endpoint['method'] == 'POST':
-                print(f"Payload: {json.dumps(endpoint['payload'], indent=2)}")
-                response = requests.post(endpoint['url'], json=endpoint['payload'])
-            else:
-                response = requests.get(endpoint['url'])
-                
-            print(f"Status Code: {response.status_code}")
+        if result['error']:
+            print(f"Error testing endpoint: {result['error']}")
+            continue
             
-            if response.status_code == 200:
-                data = response.json()
-                print("Success! Sample response:")
-                print(json.dumps(data[:2] if isinstance(data, list) else data, indent=2))
-            else:
-                print(f"Error: {response.text}")
-                
-        except Exception as e:
-            print(f"Error testing endpoint: {str(e)}")
+        status, data = result['status'], result['data']
+        print(f"Status Code: {status}")
+        
+        if status == 200:
+            print("Success! Sample response:")
+            print(orjson.dumps(data[:2] if isinstance(data, list) else data, option=orjson.OPT_INDENT_2).decode())
+        else:
+            print(f"Error: {data}")
+
+async def main(token_address):
+    # Share one keep-alive connection pool across Helius and DexScreener calls
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    timeout = aiohttp.ClientTimeout(sock_connect=3, sock_read=10)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    ) as session:
+        print("\n=== Testing Token Data Fetching ===")
+        await test_token(session, token_address)
+        
+        print("\n=== Testing Helius API Endpoints ===")
+        await test_helius_api(session, token_address)
+    
+    print("\n=== Testing Transaction Analysis ===")
+    test_transactions(token_address)
 
 if __name__ == "__main__":
     # Test token data fetching
     token_address = "9BB6NFEcjBCtnNLFko2FqVQBq8HHM13kCyYcdQbgpump"
     
-    print("\n=== Testing Token Data Fetching ===")
-    test_token(token_address)
+    # Set Helius API key for testing
+    os.environ.setdefault("HELIUS_API_KEY", "ba737b72-acf1-4d55-a893-20fdaf294be9")
     
-    print("\n=== Testing Helius API Endpoints ===")
-    test_helius_api(token_address)
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     
-    print("\n=== Testing Transaction Analysis ===")
-    test_transactions(token_address)
+    asyncio.run(main(token_address))
@@ -6,44 +6,55 @@ import os
 from dotenv import load_dotenv
 import json
 import logging
+import functools
 import sys
 
 # Load environment variables
 load_dotenv()
 
-async def main(token_address):
+@functools.lru_cache(maxsize=1)
+def _get_clients():
+    """Create the Sheets, Birdeye and auditor clients once per process"""
+    # This script posts to the audit test sheet unless the environment overrides it
+    credentials_file = os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE', 'service-account.json')
+    spreadsheet_id = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID', '1vz0RCZ-DVfWKCtaLgd1ekUuimbW-SqrUlQqYrMgY_eA')
+    
+    logger.info("Initializing Google Sheets...")
+    sheets = GoogleSheetsIntegration(
+        credentials_file=credentials_file,
+        spreadsheet_id=spreadsheet_id
+    )
+    
+    # Initialize Birdeye
+    logger.info("Initializing Birdeye...")
+    birdeye_api_key = os.getenv('BIRDEYE_API_KEY')
+    if not birdeye_api_key:
+        raise ValueError("BIRDEYE_API_KEY environment variable must be set")
+    birdeye = BirdeyeDataCollector(api_key=birdeye_api_key)
+    auditor = TokenAuditor(birdeye=birdeye, sheets=sheets)
+    return sheets, birdeye, auditor
+
+async def audit_one(token_address):
+    """Audit a single token and post the results to the sheet"""
+    _, _, auditor = _get_clients()
+    
+    # Run audit
+    logger.info(f"Running audit for token: {token_address}")
+    audit_results = await auditor.audit_token(token_address)
+    
+    # Debug print
+    logger.info("Audit Results:\n%s", json.dumps(audit_results, indent=2))
+    
+    # Post to sheet
+    logger.info("Posting to Google Sheet...")
+    await auditor.post_audit_to_sheets(audit_results)
+    logger.info("Posted audit results to sheet!")
+
+async def main(token_addresses):
     try:
-        # Get environment variables
-        credentials_file = os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE', 'service-account.json')
-        spreadsheet_id = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID', '1vz0RCZ-DVfWKCtaLgd1ekUuimbW-SqrUlQqYrMgY_eA')
-        
-        # Initialize
-        logger.info("Initializing Google Sheets...")
-        sheets = GoogleSheetsIntegration(
-            credentials_file=credentials_file,
-            spreadsheet_id=spreadsheet_id
-        )
-        
-        # Initialize Birdeye
-        logger.info("Initializing Birdeye...")
-        birdeye_api_key = os.getenv('BIRDEYE_API_KEY')
-        if not birdeye_api_key:
-            raise ValueError("BIRDEYE_API_KEY environment variable must be set")
-        birdeye = BirdeyeDataCollector(api_key=birdeye_api_key)
-        auditor = TokenAuditor(birdeye=birdeye, sheets=sheets)
-        
-        # Run audit
-        logger.info(f"Running audit for token: {token_address}")
-        audit_results = await auditor.audit_token(token_address)
-        
-        # Debug print
-        logger.info("Audit Results:")
-        logger.info(json.dumps(audit_results, indent=2))
-        
-        # Post to sheet
-        logger.info("Posting to Google Sheet...")
-        await auditor.post_audit_to_sheets(audit_results)
-        logger.info("Posted audit results to sheet!")
+        # Initialize once, then audit every token with the shared clients
+        _get_clients()
+        await asyncio.gather(*(audit_one(address) for address in token_addresses))
         
     except Exception as e:
         logger.error(f"Error in main: {str(e)}", exc_info=True)
@@ -57,7 +68,14 @@ if __name__ == "__main__":
     )
     logger = logging.getLogger(__name__)
 
-    # Get token address from command line argument, default to JPM if not provided
-    token_address = sys.argv[1] if len(sys.argv) > 1 else "JEUrtQsEp69w2sbM8Hdbn9ykhejVC8yvpdjBjDkYJPM"
+    # Get token addresses from command line arguments, default to JPM if not provided
+    token_addresses = sys.argv[1:] or ["JEUrtQsEp69w2sbM8Hdbn9ykhejVC8yvpdjBjDkYJPM"]
+    
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     
-    asyncio.run(main(token_address))
+    asyncio.run(main(token_addresses))
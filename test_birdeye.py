@@ -1,31 +1,76 @@
 import asyncio
+import functools
+import itertools
 import logging
 import os
+import aiohttp
+import aiosqlite
 from datetime import datetime
+from operator import itemgetter
 from birdeye_get_data import BirdeyeDataCollector
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INSERT_TRADE_SQL = '''
+    INSERT INTO trades (
+        tx_hash, block_time, fetch_time, side, source,
+        from_amount, from_symbol, to_amount, to_symbol, price
+    ) VALUES '''
+TRADE_ROW_PLACEHOLDER = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+TRADE_CONFLICT_CLAUSE = " ON CONFLICT(tx_hash) DO NOTHING"
+
+# Rows per multi-row INSERT; 500 rows x 10 columns stays under SQLite's 32766 bound-parameter limit
+TRADE_INSERT_CHUNK = 500
+
+@functools.lru_cache(maxsize=8)
+def _insert_trades_sql(row_count: int) -> str:
+    """Build the multi-row INSERT statement for row_count trades"""
+    return INSERT_TRADE_SQL + ", ".join([TRADE_ROW_PLACEHOLDER] * row_count) + TRADE_CONFLICT_CLAUSE
+
+# Birdeye calls allowed in flight at once from main()
+MAX_CONCURRENT_REQUESTS = 5
+
+# Pulls the stored trade fields out of a Birdeye trade dict in one call
+_trade_fields = itemgetter(
+    'txHash', 'blockUnixTime', 'side', 'source', 'from_amount',
+    'from_symbol', 'to_amount', 'to_symbol', 'price'
+)
+
+# Trades in the same block share a timestamp, so reuse the converted datetime
+_block_datetime = functools.lru_cache(maxsize=4096)(datetime.fromtimestamp)
+
 class SqliteDatabase:
     def __init__(self, db_path=":memory:"):
         self.db_path = db_path
         self._conn = None
+        self._cursor = None
 
     async def connect(self):
         """Create a connection"""
         if not self._conn:
             self._conn = await aiosqlite.connect(self.db_path)
             await self._create_tables()
+            # One cursor reused by every store_trades call
+            self._cursor = await self._conn.cursor()
         return self._conn
 
     async def _create_tables(self):
         """Create necessary tables"""
+        # page_size only takes effect before the first table is created
+        await self._conn.execute("PRAGMA page_size=8192")
+        # WAL lets a batch commit with one sync instead of a full journal fsync
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute("PRAGMA synchronous=NORMAL")
+        await self._conn.execute("PRAGMA temp_store=MEMORY")
+        await self._conn.execute("PRAGMA cache_size=-65536")
+        # Serve tx_hash uniqueness probes from a memory map instead of read() calls
+        await self._conn.execute("PRAGMA mmap_size=268435456")
+        # Keyed on tx_hash without a rowid so each insert writes a single B-tree entry
         await self._conn.execute('''
             CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                tx_hash TEXT NOT NULL UNIQUE,
+                tx_hash TEXT NOT NULL PRIMARY KEY,
                 block_time TIMESTAMP NOT NULL,
                 fetch_time TIMESTAMP NOT NULL,
                 side TEXT NOT NULL,
@@ -35,7 +80,7 @@ class SqliteDatabase:
                 to_amount REAL NOT NULL,
                 to_symbol TEXT NOT NULL,
                 price REAL
-            )
+            ) WITHOUT ROWID
         ''')
         await self._conn.commit()
 
@@ -45,39 +90,31 @@ class SqliteDatabase:
             return
 
         # Prepare the values for bulk insert
-        values = []
-        for trade in trades:
-            values.append((
-                trade['txHash'],
-                datetime.fromtimestamp(trade['blockUnixTime']),
-                fetch_time,
-                trade['side'],
-                trade['source'],
-                trade['from_amount'],
-                trade['from_symbol'],
-                trade['to_amount'],
-                trade['to_symbol'],
-                trade['price']
-            ))
+        values = [
+            (tx_hash, _block_datetime(block_time), fetch_time, side, source,
+             from_amount, from_symbol, to_amount, to_symbol, price)
+            for (tx_hash, block_time, side, source, from_amount,
+                 from_symbol, to_amount, to_symbol, price) in map(_trade_fields, trades)
+        ]
 
         try:
-            await self._conn.executemany('''
-                INSERT OR IGNORE INTO trades (
-                    tx_hash, block_time, fetch_time, side, source,
-                    from_amount, from_symbol, to_amount, to_symbol, price
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', values)
+            # Insert the whole batch in one write transaction
+            await self._cursor.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(values), TRADE_INSERT_CHUNK):
+                chunk = values[start:start + TRADE_INSERT_CHUNK]
+                await self._cursor.execute(
+                    _insert_trades_sql(len(chunk)),
+                    list(itertools.chain.from_iterable(chunk))
+                )
             await self._conn.commit()
             logger.info(f"Stored {len(values)} trades in database")
         except Exception as e:
+            await self._conn.rollback()
             logger.error(f"Error storing trades: {e}")
             raise
 
 async def main():
     """Main function to test the BirdeyeDataCollector class."""
-    # Initialize collector with API key from environment
-    collector = BirdeyeDataCollector(os.getenv('BIRDEYE_API_KEY'))
-    
     # Test with BONK token
     token_address = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
     
@@ -85,59 +122,77 @@ async def main():
     print(f"Token Address: {token_address}\n")
     
     try:
+        # Share one pooled session across every request
+        connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            # Initialize collector with API key from environment
+            collector = BirdeyeDataCollector(os.getenv('BIRDEYE_API_KEY'), session=session)
+            
+            # The calls are independent, so run them concurrently and print in order;
+            # the semaphore keeps us within Birdeye's rate limit
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            
+            async def limited(coro):
+                async with semaphore:
+                    return await coro
+            
+            (price_volume, metadata, trades, token_data, top_traders, price_changes,
+             ath_data, hourly_data, minute_data, changes, weekly_data) = await asyncio.gather(*map(limited, (
+                collector.get_current_price_and_volume(token_address),
+                collector.get_token_metadata(token_address),
+                collector.get_recent_trades(token_address, limit=5),
+                collector.get_token_data(token_address),
+                collector.get_top_traders(token_address, timeframe="1h", limit=5),
+                collector.get_historical_price_changes(token_address),
+                collector.get_ath_price_change(token_address),
+                collector.get_24h_hourly_ohlcv(token_address),
+                collector.get_minute_ohlcv(token_address, minutes=5),
+                collector.get_price_changes(token_address),
+                collector.get_1y_weekly_ohlcv(token_address),
+            )))
+        
         # 1. Test get_current_price_and_volume
         print("1. Getting current price and volume...")
-        price_volume = await collector.get_current_price_and_volume(token_address)
         print(f"Price/Volume data: {price_volume}\n")
         
         # 2. Test get_token_metadata
         print("2. Getting token metadata...")
-        metadata = await collector.get_token_metadata(token_address)
         print(f"Token metadata: {metadata}\n")
         
         # 3. Test get_recent_trades
         print("3. Getting recent trades...")
-        trades = await collector.get_recent_trades(token_address, limit=5)
         print(f"Recent trades (5): {trades}\n")
         
         # 4. Test get_token_data
         print("4. Getting comprehensive token data...")
-        token_data = await collector.get_token_data(token_address)
         print(f"Token data: {token_data}\n")
         
         # 5. Test get_top_traders
         print("5. Getting top traders...")
-        top_traders = await collector.get_top_traders(token_address, timeframe="1h", limit=5)
         print(f"Top traders: {top_traders}\n")
         
         # 6. Test get_historical_price_changes
         print("6. Getting historical price changes...")
-        price_changes = await collector.get_historical_price_changes(token_address)
         print(f"Historical price changes: {price_changes}\n")
         
         # 7. Test get_ath_price_change
         print("7. Getting ATH price change...")
-        ath_data = await collector.get_ath_price_change(token_address)
         print(f"ATH data: {ath_data}\n")
         
         # 8. Test get_24h_hourly_ohlcv
         print("8. Getting 24h hourly OHLCV...")
-        hourly_data = await collector.get_24h_hourly_ohlcv(token_address)
         print(f"24h hourly data (first 2 entries): {hourly_data[:2]}\n")
         
         # 9. Test get_minute_ohlcv
         print("9. Getting minute OHLCV...")
-        minute_data = await collector.get_minute_ohlcv(token_address, minutes=5)
         print(f"5-minute data (first 2 entries): {minute_data[:2]}\n")
         
         # 10. Test get_price_changes
         print("10. Getting price changes...")
-        changes = await collector.get_price_changes(token_address)
         print(f"Price changes: {changes}\n")
         
         # 11. Test get_1y_weekly_ohlcv
         print("11. Getting 1Y weekly OHLCV data...")
-        weekly_data = await collector.get_1y_weekly_ohlcv(token_address)
         print(f"Weekly data (first 2 entries): {weekly_data[:2] if weekly_data else []}\n")
         print(f"Total weeks of data: {len(weekly_data)}")
         
@@ -0,0 +1,393 @@
+"""Offline tests for TransactionAnalyzer.
+
+Helius and DexScreener are replaced by a stubbed aiohttp session, and the disk
+cache lives in a temporary directory, so no network access or API key is needed.
+Run with `python -m unittest test_transaction_analyzer` or pytest.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+from transaction_analyzer import TransactionAnalyzer
+
+TOKEN = "TokenMint111"
+OTHER_MINT = "So11111111111111111111111111111111111111112"
+
+
+class FakeResponse:
+    """The parts of aiohttp.ClientResponse the analyzer uses."""
+
+    def __init__(self, status=200, payload=None, headers=None):
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+        self.released = False
+
+    async def json(self, loads=None):
+        return self.payload
+
+    async def text(self):
+        return str(self.payload)
+
+    def release(self):
+        self.released = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class FakeRequest:
+    """Like aiohttp's request context manager: usable with both await and async with."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def __await__(self):
+        async def resolve():
+            return self.response
+        return resolve().__await__()
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.response.release()
+
+
+class FakeSession:
+    """Serves queued Helius responses in order and a fixed DexScreener response."""
+
+    def __init__(self, helius_responses=(), dex_response=None):
+        self.helius_responses = list(helius_responses)
+        self.dex_response = dex_response
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append((url, params))
+        if 'dexscreener' in url:
+            return FakeRequest(self.dex_response)
+        return FakeRequest(self.helius_responses.pop(0))
+
+    @property
+    def helius_calls(self):
+        return [call for call in self.calls if 'dexscreener' not in call[0]]
+
+    async def close(self):
+        pass
+
+
+def dex_response(price="2.5"):
+    return FakeResponse(payload={'pairs': [{
+        'chainId': 'solana',
+        'priceUsd': price,
+        'marketCap': 1000000,
+        'baseToken': {'symbol': 'TOK'}
+    }]})
+
+
+def swap(timestamp, wallet, sol, token_amount, signature):
+    """A SWAP where the wallet pays `sol` SOL for `token_amount` of the tracked token."""
+    return {
+        'signature': signature,
+        'timestamp': timestamp,
+        'type': 'SWAP',
+        'feePayer': wallet,
+        'description': 'swap',
+        'nativeTransfers': [{'amount': sol * 1e9}],
+        'tokenTransfers': [
+            {'mint': TOKEN, 'tokenAmount': token_amount, 'toUserAccount': wallet},
+            {'mint': OTHER_MINT, 'tokenAmount': -sol, 'toUserAccount': 'pool'}
+        ]
+    }
+
+
+class AnalyzerTestCase(unittest.IsolatedAsyncioTestCase):
+    """Gives every test a fresh analyzer with isolated class-level caches."""
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        for name, value in (
+            ('CACHE_DIR', self.cache_dir),
+            ('HELIUS_REQUEST_INTERVAL', 0),
+            ('_mem_cache', OrderedDict()),
+            ('_negative_cache', {}),
+            ('_dex_cache', {}),
+            ('_disk_entries', None),
+            ('_disk_bytes', 0),
+        ):
+            patcher = mock.patch.object(TransactionAnalyzer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.analyzer = TransactionAnalyzer('test-key')
+
+    def use_session(self, *helius_responses, dex=None):
+        self.analyzer.session = FakeSession(helius_responses, dex or dex_response())
+        return self.analyzer.session
+
+
+class AnalyzeTransactionsTests(AnalyzerTestCase):
+
+    async def test_output_keys_and_categories(self):
+        now = int(time.time())
+        # Newest first, as Helius returns them; the last one is outside the window
+        page = [
+            swap(now - 10, 'whale', 150, 1000, 'sig5'),
+            swap(now - 20, 'retail1', 0.05, 10, 'sig4'),
+            swap(now - 30, 'retail2', 2, 100, 'sig3'),
+            swap(now - 40, 'retail1', 0.5, 50, 'sig2'),
+            swap(now - 50, 'retail1', 20, 1000, 'sig1'),
+            swap(now - 3600, 'old', 1, 1, 'sig0'),
+        ]
+        self.use_session(FakeResponse(payload=page))
+
+        analysis = await self.analyzer.analyze_transactions(TOKEN, minutes=5)
+
+        for key in ('volume_distribution', 'trader_categories', 'suspicious_wallets',
+                    'patterns', 'volume_by_type', 'wallet_categories'):
+            self.assertIn(key, analysis)
+        self.assertEqual(analysis['transaction_count'], 5)
+        self.assertEqual(analysis['active_wallets'], 3)
+        self.assertEqual(analysis['token_ticker'], 2.5)
+        self.assertAlmostEqual(analysis['total_volume'], 172.55)
+
+        # Transactions come back in chronological order
+        self.assertEqual([tx['signature'] for tx in analysis['transactions']],
+                         ['sig1', 'sig2', 'sig3', 'sig4', 'sig5'])
+
+        distribution = analysis['volume_distribution']
+        self.assertEqual(list(distribution), list(TransactionAnalyzer.VOLUME_BUCKETS))
+        self.assertEqual({name: bucket['count'] for name, bucket in distribution.items()},
+                         {'very_small': 1, 'small': 1, 'medium': 1, 'large': 1, 'very_large': 1})
+
+        self.assertEqual(analysis['suspicious_wallets'], {'retail1': 3, 'whale': 1, 'retail2': 1})
+
+        trader_categories = analysis['trader_categories']
+        self.assertEqual(list(trader_categories), list(TransactionAnalyzer.TRADER_CATEGORIES))
+        self.assertEqual(analysis['wallet_categories']['whale'], 'whale')
+        self.assertEqual(trader_categories['whale']['count'], 1)
+        self.assertEqual(trader_categories['whale']['buys'], 150)
+        self.assertEqual(trader_categories['retail']['count'], 2)
+        self.assertEqual(len(trader_categories['retail']['transactions']), 4)
+
+    async def test_no_transactions_returns_none(self):
+        self.use_session(FakeResponse(payload=[]))
+        self.assertIsNone(await self.analyzer.analyze_transactions(TOKEN))
+
+
+class VolumeDistributionTests(AnalyzerTestCase):
+
+    def counts(self, volumes, sol_value_flags):
+        distribution = self.analyzer._volume_distribution(volumes, sol_value_flags)
+        return [distribution[name]['count'] for name in TransactionAnalyzer.VOLUME_BUCKETS]
+
+    def test_sol_bucket_edges_are_exclusive_upper_bounds(self):
+        volumes = [0.0999, 0.1, 0.999, 1, 9.99, 10, 99.9, 100]
+        self.assertEqual(self.counts(volumes, [True] * len(volumes)), [1, 2, 2, 2, 1])
+
+    def test_token_bucket_edges_are_exclusive_upper_bounds(self):
+        volumes = [99, 100, 999, 1000, 10000, 99999, 100000]
+        self.assertEqual(self.counts(volumes, [False] * len(volumes)), [1, 2, 1, 2, 1])
+
+    def test_thresholds_follow_the_value_kind(self):
+        # 50 is "large" in SOL but "very_small" in tokens
+        self.assertEqual(self.counts([50, 50], [True, False]), [1, 0, 0, 1, 0])
+
+    def test_zero_volumes_are_not_counted(self):
+        distribution = self.analyzer._volume_distribution([0, 0, 5], [True, False, True])
+        self.assertEqual(sum(bucket['count'] for bucket in distribution.values()), 1)
+        self.assertEqual(distribution['medium'], {'count': 1, 'amount': 5.0})
+
+
+class MemoryCacheTests(AnalyzerTestCase):
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        expires_at = time.time() + 60
+        with mock.patch.object(TransactionAnalyzer, 'MEM_CACHE_SIZE', 2):
+            self.analyzer._remember('a', expires_at, [{'timestamp': 100}])
+            self.analyzer._remember('b', expires_at, [{'timestamp': 100}])
+            # Reading 'a' makes 'b' the least recently used
+            self.assertIsNotNone(await self.analyzer._get_cached_transactions('a', 0))
+            self.analyzer._remember('c', expires_at, [{'timestamp': 100}])
+
+        self.assertEqual(list(TransactionAnalyzer._mem_cache), ['a', 'c'])
+
+    async def test_expired_entry_is_dropped(self):
+        self.analyzer._remember('a', time.time() - 1, [{'timestamp': 100}])
+        self.assertIsNone(await self.analyzer._get_cached_transactions('a', 0))
+        self.assertNotIn('a', TransactionAnalyzer._mem_cache)
+
+    async def test_hits_are_filtered_to_the_window(self):
+        self.analyzer._remember('a', time.time() + 60, [{'timestamp': 100}, {'timestamp': 200}])
+        self.assertEqual(await self.analyzer._get_cached_transactions('a', 150), [{'timestamp': 200}])
+        self.assertIsNone(await self.analyzer._get_cached_transactions('a', 300))
+
+    async def test_hits_do_not_share_dicts_with_the_cache(self):
+        transactions = [{'timestamp': 100, 'signature': 'sig'}]
+        await self.analyzer._cache_transactions('a', transactions)
+        # Neither the caller's list nor a previous hit can change the cached entry
+        transactions[0]['signature'] = 'changed'
+        hit = await self.analyzer._get_cached_transactions('a', 0)
+        hit[0]['signature'] = 'changed'
+
+        cached = await self.analyzer._get_cached_transactions('a', 0)
+        self.assertEqual(cached, [{'timestamp': 100, 'signature': 'sig'}])
+
+    async def test_disk_entry_is_loaded_into_memory(self):
+        await self.analyzer._cache_transactions('a', [{'timestamp': 100}])
+        TransactionAnalyzer._mem_cache.clear()
+
+        self.assertEqual(await self.analyzer._get_cached_transactions('a', 0), [{'timestamp': 100}])
+        self.assertIn('a', TransactionAnalyzer._mem_cache)
+
+
+class DiskCacheTests(AnalyzerTestCase):
+
+    def cache_files(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_oldest_files_are_evicted_over_the_size_cap(self):
+        payload = [{'timestamp': 100, 'signature': 'x' * 400}]
+        # Room for two of these files but not three
+        with mock.patch.object(TransactionAnalyzer, 'MAX_CACHE_SIZE_MB', 1000 / (1024 * 1024)):
+            for token in ('a', 'b', 'c'):
+                self.analyzer._write_cache_file(token, payload)
+
+        self.assertEqual(self.cache_files(), ['b.json', 'c.json'])
+        self.assertEqual(TransactionAnalyzer._disk_bytes,
+                         sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in self.cache_files()))
+
+    def test_existing_files_are_counted_on_first_write(self):
+        with open(os.path.join(self.cache_dir, 'old.json'), 'wb') as f:
+            f.write(b'[' + b' ' * 900 + b']')
+        with mock.patch.object(TransactionAnalyzer, 'MAX_CACHE_SIZE_MB', 1000 / (1024 * 1024)):
+            self.analyzer._write_cache_file('new', [{'timestamp': 100, 'signature': 'x' * 400}])
+
+        self.assertEqual(self.cache_files(), ['new.json'])
+
+    def test_rewriting_a_file_replaces_its_size(self):
+        self.analyzer._write_cache_file('a', [{'timestamp': 100}])
+        self.analyzer._write_cache_file('a', [{'timestamp': 100, 'signature': 'sig'}])
+
+        self.assertEqual(TransactionAnalyzer._disk_bytes,
+                         os.path.getsize(os.path.join(self.cache_dir, 'a.json')))
+
+    def test_expired_file_is_removed_on_read(self):
+        self.analyzer._write_cache_file('a', [{'timestamp': 100}])
+        path = os.path.join(self.cache_dir, 'a.json')
+        stale = time.time() - TransactionAnalyzer.CACHE_TTL - 1
+        os.utime(path, (stale, stale))
+
+        self.assertIsNone(self.analyzer._read_cache_file('a'))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(TransactionAnalyzer._disk_bytes, 0)
+
+
+class NegativeCacheTests(AnalyzerTestCase):
+
+    async def test_empty_result_skips_the_next_crawl(self):
+        session = self.use_session(FakeResponse(payload=[]))
+
+        self.assertEqual(await self.analyzer.fetch_transactions(TOKEN), [])
+        self.assertEqual(await self.analyzer.fetch_transactions(TOKEN), [])
+        self.assertEqual(len(session.helius_calls), 1)
+
+    async def test_expired_entry_crawls_again(self):
+        session = self.use_session(FakeResponse(payload=[]), FakeResponse(payload=[]))
+
+        await self.analyzer.fetch_transactions(TOKEN)
+        TransactionAnalyzer._negative_cache[TOKEN] = time.time() - 1
+        await self.analyzer.fetch_transactions(TOKEN)
+
+        self.assertEqual(len(session.helius_calls), 2)
+
+    async def test_failed_fetch_is_not_cached(self):
+        session = self.use_session(FakeResponse(status=500, payload='boom'), FakeResponse(payload=[]))
+
+        self.assertEqual(await self.analyzer.fetch_transactions(TOKEN), [])
+        self.assertNotIn(TOKEN, TransactionAnalyzer._negative_cache)
+        await self.analyzer.fetch_transactions(TOKEN)
+        self.assertEqual(len(session.helius_calls), 2)
+
+
+class FetchTransactionsTests(AnalyzerTestCase):
+
+    async def test_pages_are_followed_until_the_window_ends(self):
+        now = int(time.time())
+        first_page = [swap(now - 10, 'w1', 1, 10, 'sig3'), swap(now - 20, 'w2', 1, 10, 'sig2')]
+        # Millisecond timestamps are normalized to seconds
+        second_page = [swap((now - 30) * 1000, 'w1', 1, 10, 'sig1'), swap(now - 3600, 'w3', 1, 10, 'sig0')]
+        session = self.use_session(FakeResponse(payload=first_page), FakeResponse(payload=second_page))
+
+        transactions = await self.analyzer.fetch_transactions(TOKEN, minutes=5)
+
+        self.assertEqual([tx['signature'] for tx in transactions], ['sig1', 'sig2', 'sig3'])
+        self.assertEqual(transactions[0]['timestamp'], now - 30)
+        self.assertEqual(transactions[0]['_value'], (1.0, True))
+        # The second page continues from the first page's last signature
+        self.assertEqual(session.helius_calls[1][1]['before'], 'sig2')
+
+    async def test_cached_transactions_skip_the_crawl(self):
+        now = int(time.time())
+        session = self.use_session(FakeResponse(payload=[swap(now - 10, 'w1', 1, 10, 'sig1'),
+                                                         swap(now - 3600, 'w2', 1, 10, 'sig0')]))
+
+        first = await self.analyzer.fetch_transactions(TOKEN)
+        second = await self.analyzer.fetch_transactions(TOKEN)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(session.helius_calls), 1)
+
+
+class RetryTests(AnalyzerTestCase):
+
+    async def get(self, *responses):
+        session = FakeSession(responses)
+        with mock.patch('asyncio.sleep', new=mock.AsyncMock()) as sleep, \
+                mock.patch('random.random', return_value=0):
+            response = await self.analyzer._get_with_retry(session, 'https://api.helius.xyz/test')
+        return response, session, [call.args[0] for call in sleep.await_args_list]
+
+    async def test_rate_limits_back_off_exponentially(self):
+        throttled = [FakeResponse(status=429), FakeResponse(status=503)]
+        response, session, delays = await self.get(*throttled, FakeResponse(payload=[]))
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(session.calls), 3)
+        self.assertEqual(delays, [0.5, 1.0])
+        self.assertTrue(all(r.released for r in throttled))
+
+    async def test_retry_after_header_is_honoured(self):
+        response, _, delays = await self.get(
+            FakeResponse(status=429, headers={'Retry-After': '3'}), FakeResponse(payload=[])
+        )
+        self.assertEqual(response.status, 200)
+        self.assertEqual(delays, [3])
+
+    async def test_last_response_is_returned_after_max_retries(self):
+        responses = [FakeResponse(status=502) for _ in range(TransactionAnalyzer.MAX_RETRIES)]
+        response, session, delays = await self.get(*responses)
+
+        self.assertIs(response, responses[-1])
+        self.assertFalse(response.released)
+        self.assertEqual(len(session.calls), TransactionAnalyzer.MAX_RETRIES)
+        self.assertEqual(len(delays), TransactionAnalyzer.MAX_RETRIES - 1)
+
+    async def test_other_errors_are_not_retried(self):
+        response, session, delays = await self.get(FakeResponse(status=404))
+        self.assertEqual(response.status, 404)
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(delays, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,27 @@
 import os
 import asyncio
+import functools
+import sys
 from datetime import datetime
+from heapq import nlargest
 from transaction_analyzer import TransactionAnalyzer
-from collections import defaultdict
+import numpy as np
 
 # Set Helius API key for testing
 os.environ["HELIUS_API_KEY"] = "ba737b72-acf1-4d55-a893-20fdaf294be9"
 
+@functools.lru_cache(maxsize=4096)
 def format_timestamp(timestamp):
     return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
 
+VOLUME_BUCKET_LABELS = (
+    "Very Small (<0.1 SOL)",
+    "Small (0.1-1 SOL)",
+    "Medium (1-10 SOL)",
+    "Large (10-100 SOL)",
+    "Very Large (>100 SOL)",
+)
+
 def format_percentage(value):
     return f"{value:.1f}%" if value is not None else "N/A"
 
@@ -20,31 +32,31 @@ async def test_transactions():
     
     print(f"\nTesting transaction analysis for last {minutes} minutes...")
     
-    analyzer = TransactionAnalyzer()
-    analysis = await analyzer.analyze_transactions(token_address, minutes)
+    async with TransactionAnalyzer() as analyzer:
+        analysis = await analyzer.analyze_transactions(token_address, minutes)
     
     if analysis:
-        print("\n=== Transaction Overview ===")
-        print(f"Total Transactions: {analysis['transaction_count']}")
-        print(f"Active Wallets: {analysis['active_wallets']}")
-        print(f"Trading Velocity: {analysis['trading_velocity']:.2f} tx/min")
-        print(f"Total Volume: {analysis['total_volume']:.2f} SOL")
+        # Collect the report and write it to stdout in one call
+        out = []
+        emit = out.append
+        
+        emit("\n=== Transaction Overview ===")
+        emit(f"Total Transactions: {analysis['transaction_count']}")
+        emit(f"Active Wallets: {analysis['active_wallets']}")
+        emit(f"Trading Velocity: {analysis['trading_velocity']:.2f} tx/min")
+        emit(f"Total Volume: {analysis['total_volume']:.2f} SOL")
         
-        print("\n=== Volume Distribution ===")
+        emit("\n=== Volume Distribution ===")
         total_tx = analysis['transaction_count']
-        vd = analysis['volume_distribution']
         
-        def print_volume_category(name, data, total_tx):
-            print(f"• {name}: {data['count']} trades ({data['count']/total_tx*100:.1f}%)")
-            print(f"  Volume: {data['amount']:.2f} SOL")
-            
-        print_volume_category("Very Small (<0.1 SOL)", vd['very_small'], total_tx)
-        print_volume_category("Small (0.1-1 SOL)", vd['small'], total_tx)
-        print_volume_category("Medium (1-10 SOL)", vd['medium'], total_tx)
-        print_volume_category("Large (10-100 SOL)", vd['large'], total_tx)
-        print_volume_category("Very Large (>100 SOL)", vd['very_large'], total_tx)
+        # The analyzer already buckets trade sizes; reuse its distribution
+        volume_dist = analysis['volume_distribution']
+        for name, bucket in zip(VOLUME_BUCKET_LABELS, TransactionAnalyzer.VOLUME_BUCKETS):
+            count = volume_dist[bucket]['count']
+            emit(f"• {name}: {count} trades ({count/total_tx*100:.1f}%)")
+            emit(f"  Volume: {volume_dist[bucket]['amount']:.2f} SOL")
 
-        print("\n=== Trader Categories ===")
+        emit("\n=== Trader Categories ===")
         tc = analysis['trader_categories']
         
         def print_category(name, data):
@@ -53,12 +65,12 @@ async def test_transactions():
                 buy_pct = (data['buys'] / total * 100) if total > 0 else 0
                 sell_pct = (data['sells'] / total * 100) if total > 0 else 0
                 tx_count = sum(1 for tx in data.get('transactions', []))
-                print(f"{name}:")
-                print(f"• Wallets: {data['count']}")
-                print(f"• Transactions: {tx_count}")
-                print(f"• Volume: {data['volume']:.2f} SOL")
-                print(f"• Buy/Sell: {buy_pct:.1f}% / {sell_pct:.1f}%")
-                print()
+                emit(f"{name}:")
+                emit(f"• Wallets: {data['count']}")
+                emit(f"• Transactions: {tx_count}")
+                emit(f"• Volume: {data['volume']:.2f} SOL")
+                emit(f"• Buy/Sell: {buy_pct:.1f}% / {sell_pct:.1f}%")
+                emit("")
 
         print_category("Large Market Makers", tc['large_market_maker'])
         print_category("Market Making Bots", tc['market_making_bot'])
@@ -66,51 +78,58 @@ async def test_transactions():
         print_category("Whales", tc['whale'])
         print_category("Retail Traders", tc['retail'])
 
-        print("\n=== Top Wallets by Volume ===")
-        wallet_volumes = defaultdict(float)
-        wallet_txs = defaultdict(int)
-        wallet_buys = defaultdict(float)
-        wallet_sells = defaultdict(float)
+        emit("\n=== Top Wallets by Volume ===")
+        # Flatten the categorized transactions into parallel arrays
+        txs = [tx for category in tc.values() for tx in category.get('transactions', [])]
+        amounts = np.fromiter((tx['amount'] for tx in txs), dtype=np.float64, count=len(txs))
+        is_buy = np.fromiter((tx['is_buy'] for tx in txs), dtype=bool, count=len(txs))
+        
+        # Number wallets in first-seen order, so equal totals keep that order below
+        wallet_codes = {}
+        codes = np.fromiter(
+            (wallet_codes.setdefault(tx.get('wallet', 'unknown'), len(wallet_codes)) for tx in txs),
+            dtype=np.intp, count=len(txs)
+        )
+        unique_wallets = list(wallet_codes)
+        
+        # Per-wallet reductions over the wallet codes
+        n_wallets = len(unique_wallets)
+        volumes = np.bincount(codes, weights=amounts, minlength=n_wallets)
+        buys = np.bincount(codes, weights=np.where(is_buy, amounts, 0.0), minlength=n_wallets)
+        sells = volumes - buys
+        tx_counts = np.bincount(codes, minlength=n_wallets)
+        
+        def top_indices(values, k=10):
+            # Bounded heap of k indices instead of sorting every wallet; nlargest keeps
+            # ties in first-seen order, including at the cut-off
+            return nlargest(k, range(len(values)), key=values.__getitem__)
         
-        for category in tc.values():
-            for tx in category.get('transactions', []):
-                wallet = tx.get('wallet', 'unknown')
-                wallet_volumes[wallet] += tx['amount']
-                wallet_txs[wallet] += 1
-                if tx['is_buy']:
-                    wallet_buys[wallet] += tx['amount']
-                else:
-                    wallet_sells[wallet] += tx['amount']
+        def print_wallet(i, count_first=False):
+            total = buys[i] + sells[i]
+            buy_pct = (buys[i] / total * 100) if total > 0 else 0
+            sell_pct = (sells[i] / total * 100) if total > 0 else 0
+            emit(f"• {unique_wallets[i][:8]}...")
+            if count_first:
+                emit(f"  - Transactions: {tx_counts[i]}")
+                emit(f"  - Volume: {volumes[i]:.2f} SOL")
+            else:
+                emit(f"  - Volume: {volumes[i]:.2f} SOL")
+                emit(f"  - Transactions: {tx_counts[i]}")
+            emit(f"  - Buy/Sell: {buy_pct:.1f}% / {sell_pct:.1f}%")
+            emit("")
         
-        top_by_volume = sorted(wallet_volumes.items(), key=lambda x: x[1], reverse=True)[:10]
-        for wallet, volume in top_by_volume:
-            total = wallet_buys[wallet] + wallet_sells[wallet]
-            buy_pct = (wallet_buys[wallet] / total * 100) if total > 0 else 0
-            sell_pct = (wallet_sells[wallet] / total * 100) if total > 0 else 0
-            print(f"• {wallet[:8]}...")
-            print(f"  - Volume: {volume:.2f} SOL")
-            print(f"  - Transactions: {wallet_txs[wallet]}")
-            print(f"  - Buy/Sell: {buy_pct:.1f}% / {sell_pct:.1f}%")
-            print()
+        for i in top_indices(volumes):
+            print_wallet(i)
 
-        print("\n=== Top Wallets by Transaction Count ===")
-        top_by_txs = sorted(wallet_txs.items(), key=lambda x: x[1], reverse=True)[:10]
-        for wallet, tx_count in top_by_txs:
-            volume = wallet_volumes[wallet]
-            total = wallet_buys[wallet] + wallet_sells[wallet]
-            buy_pct = (wallet_buys[wallet] / total * 100) if total > 0 else 0
-            sell_pct = (wallet_sells[wallet] / total * 100) if total > 0 else 0
-            print(f"• {wallet[:8]}...")
-            print(f"  - Transactions: {tx_count}")
-            print(f"  - Volume: {volume:.2f} SOL")
-            print(f"  - Buy/Sell: {buy_pct:.1f}% / {sell_pct:.1f}%")
-            print()
+        emit("\n=== Top Wallets by Transaction Count ===")
+        for i in top_indices(tx_counts):
+            print_wallet(i, count_first=True)
 
-        print("\n=== Suspicious Wallets ===")
+        emit("\n=== Suspicious Wallets ===")
         for wallet, tx_count in analysis['suspicious_wallets'].items():
-            print(f"• {wallet[:8]}...: {tx_count} transactions")
+            emit(f"• {wallet[:8]}...: {tx_count} transactions")
         
-        print()  
+        sys.stdout.write("\n".join(out) + "\n\n")
     else:
         print("Failed to analyze transactions")
 
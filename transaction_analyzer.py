@@ -1,17 +1,82 @@
 import os
+import mmap
+import sys
+import threading
 import time
-import statistics
-from datetime import datetime
-import requests
+import random
+import logging
+import math
 import asyncio
-import json
-from collections import defaultdict
+from heapq import nlargest
+from operator import itemgetter
+from collections import OrderedDict, defaultdict, namedtuple
 import aiohttp
+import numpy as np
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Per-transaction signals gathered by TransactionAnalyzer._extract_tx_features
+TxFeatures = namedtuple('TxFeatures', (
+    'is_swap', 'transfer_count', 'token_amount', 'first_token_amount',
+    'other_amount', 'other_mint', 'has_native', 'sol_amount', 'is_flash_loan'
+))
+
+# Shared default for missing transfer lists, so lookups don't allocate a new list
+EMPTY = ()
+
+def _amt(transfer, key='tokenAmount'):
+    """Read a transfer's absolute amount as a float, treating a missing or null amount as zero."""
+    value = transfer.get(key)
+    return abs(float(value)) if value else 0.0
+
+def _counters(*names):
+    """Create zeroed {'count', 'amount'} counters for the given names."""
+    return {name: {'count': 0, 'amount': 0.0} for name in names}
+
+def _tally(counter, amount):
+    """Add one event of the given amount to a {'count', 'amount'} counter."""
+    counter['count'] += 1
+    counter['amount'] += amount
 
 class TransactionAnalyzer:
     # Static cache for all instances
     CACHE_TTL = 60  # Cache TTL in seconds
     CACHE_DIR = "/tmp/transaction_cache"
+    # In-process LRU in front of the disk cache: token address -> (expires_at, transactions)
+    MEM_CACHE_SIZE = 64
+    # Disk cache files at least this large are parsed through mmap
+    MMAP_MIN_BYTES = 64 * 1024
+    _mem_cache = OrderedDict()
+    # Disk cache size cap; oldest files are evicted first
+    MAX_CACHE_SIZE_MB = 100
+    _disk_entries = None  # cache path -> (mtime, size), scanned on first write
+    _disk_bytes = 0
+    _disk_lock = threading.Lock()
+    # Tokens whose last fetch found nothing: token address -> expires_at
+    NEGATIVE_CACHE_TTL = 15
+    _negative_cache = {}
+    # DexScreener lookups: token address -> (expires_at, {'price', 'ticker', 'market_cap_usd'})
+    DEX_CACHE_TTL = 15
+    _dex_cache = {}
+    HELIUS_TX_URL = "https://api.helius.xyz/v0/addresses/{}/transactions"
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+    # Statuses worth retrying: rate limits and gateway errors
+    RETRY_STATUSES = (429, 502, 503, 504)
+    MAX_RETRIES = 4
+    # Minimum spacing between Helius requests (10 per second)
+    HELIUS_REQUEST_INTERVAL = 0.1
+    # Token analyses run at once by analyze_many, matching the per-host connection limit
+    MAX_CONCURRENT_ANALYSES = 16
+    
+    # Volume buckets and their exclusive upper bounds
+    VOLUME_BUCKETS = ('very_small', 'small', 'medium', 'large', 'very_large')
+    SOL_VOLUME_THRESHOLDS = (0.1, 1, 10, 100)
+    TOKEN_VOLUME_THRESHOLDS = (100, 1000, 10000, 100000)
+    # A wallet's trade counts as rapid when it follows its previous trade within this many seconds
+    RAPID_TRADE_SECONDS = 10
+    # Categories returned by _categorize_trader, in report order
+    TRADER_CATEGORIES = ('large_market_maker', 'market_making_bot', 'sniper_bot', 'whale', 'retail')
     
     def __init__(self, helius_api_key=None):
         """Initialize the transaction analyzer with optional API key."""
@@ -23,11 +88,12 @@ class TransactionAnalyzer:
         os.makedirs(self.CACHE_DIR, exist_ok=True)
         
         self.session = None
+        self._next_request_at = 0.0
+        self._page_params = {'api-key': self.api_key, 'commitment': 'finalized', 'maxVersion': 0, 'limit': 100}
         
     async def __aenter__(self):
         """Initialize aiohttp session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        await self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -36,318 +102,545 @@ class TransactionAnalyzer:
             await self.session.close()
             self.session = None
     
+    async def _get_session(self):
+        """Return the pooled aiohttp session, creating it on first use."""
+        if not self.session:
+            # Up to 16 connections to each of Helius and DexScreener, kept alive between polls
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, limit_per_host=16, keepalive_timeout=30, ttl_dns_cache=300
+                ),
+                timeout=self.REQUEST_TIMEOUT
+            )
+        return self.session
+    
+    async def _get_with_retry(self, session, url, params=None):
+        """GET a URL, retrying rate limits and gateway errors with exponential backoff."""
+        for attempt in range(self.MAX_RETRIES):
+            await self._throttle()
+            response = await session.get(url, params=params)
+            if response.status not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES - 1:
+                return response
+            
+            # Honour Retry-After when the server sends it
+            retry_after = response.headers.get('Retry-After', '')
+            response.release()
+            delay = int(retry_after) if retry_after.isdigit() else 0.5 * 2 ** attempt + random.random() * 0.1
+            logger.warning("Got %s from %s, retrying in %.1fs (attempt %d/%d)",
+                           response.status, url, delay, attempt + 1, self.MAX_RETRIES)
+            await asyncio.sleep(delay)
+    
+    async def _throttle(self):
+        """Wait for the next free Helius request slot, spacing requests HELIUS_REQUEST_INTERVAL apart."""
+        now = time.monotonic()
+        slot = max(now, self._next_request_at)
+        # Claim the slot before sleeping so concurrent fetches queue behind it
+        self._next_request_at = slot + self.HELIUS_REQUEST_INTERVAL
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
     def _get_cache_path(self, token_address):
         """Get cache file path for a token address."""
         return os.path.join(self.CACHE_DIR, f"{token_address}.json")
     
-    def _get_cached_transactions(self, token_address, cutoff_time):
+    async def _get_cached_transactions(self, token_address, cutoff_time):
         """Get cached transactions that are still valid."""
+        # Memory tier first: no stat, open or parse while the entry is fresh
+        entry = self._mem_cache.get(token_address)
+        if entry is not None:
+            expires_at, cached_data = entry
+            if time.time() < expires_at:
+                self._mem_cache.move_to_end(token_address)
+                return self._filter_cached(cached_data, cutoff_time)
+            del self._mem_cache[token_address]
+        
+        # Disk tier: stat, read and parse off the event loop
+        entry = await asyncio.to_thread(self._read_cache_file, token_address)
+        if entry is None:
+            return None
+        expires_at, cached_data = entry
+        self._remember(token_address, expires_at, cached_data)
+        return self._filter_cached(cached_data, cutoff_time)
+    
+    def _read_cache_file(self, token_address):
+        """Read a token's disk cache file as (expires_at, transactions), or None if missing or expired."""
         cache_path = self._get_cache_path(token_address)
-        if not os.path.exists(cache_path):
+        # One stat call covers both the existence and the expiry check
+        try:
+            st = os.stat(cache_path)
+        except FileNotFoundError:
             return None
             
         # Check if cache is expired
-        if time.time() - os.path.getmtime(cache_path) > self.CACHE_TTL:
-            os.remove(cache_path)
+        mtime = st.st_mtime
+        if time.time() - mtime > self.CACHE_TTL:
+            with self._disk_lock:
+                self._remove_cache_file(cache_path)
             return None
             
         try:
-            with open(cache_path, 'r') as f:
-                cached_data = json.load(f)
-                
-            # Filter transactions by time
-            cached_txs = [tx for tx in cached_data 
-                         if self._get_tx_time(tx) >= cutoff_time]
-            if cached_txs:
-                print("Using cached transactions")
-                return cached_txs
+            with open(cache_path, 'rb') as f:
+                if st.st_size >= self.MMAP_MIN_BYTES:
+                    # Parse large caches straight from the page cache without copying them into a bytes object
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        cached_data = orjson.loads(view)
+                else:
+                    cached_data = orjson.loads(f.read())
+            return mtime + self.CACHE_TTL, cached_data
         except Exception as e:
-            print(f"Error reading cache: {e}")
+            logger.warning("Error reading cache: %s", e)
             
         return None
     
-    def _cache_transactions(self, token_address, transactions):
+    def _filter_cached(self, cached_data, cutoff_time):
+        """Keep cached transactions inside the time window, or None if there are none.
+        
+        Hits get shallow copies, so callers can't alter the cached entries.
+        """
+        cached_txs = [dict(tx) for tx in cached_data
+                      if self._get_tx_time(tx) >= cutoff_time]
+        return cached_txs or None
+    
+    @classmethod
+    def _remember(cls, token_address, expires_at, transactions):
+        """Store transactions in the in-process cache, evicting the least recently used."""
+        cls._mem_cache[token_address] = (expires_at, transactions)
+        cls._mem_cache.move_to_end(token_address)
+        while len(cls._mem_cache) > cls.MEM_CACHE_SIZE:
+            cls._mem_cache.popitem(last=False)
+    
+    async def _cache_transactions(self, token_address, transactions):
         """Cache transactions for future use."""
+        # The caller keeps the fetched dicts, so the cache holds its own shallow copies
+        snapshot = [dict(tx) for tx in transactions]
+        self._remember(token_address, time.time() + self.CACHE_TTL, snapshot)
+        # The memory tier serves hits right away; the disk copy is written off the event loop
+        await asyncio.to_thread(self._write_cache_file, token_address, snapshot)
+    
+    def _write_cache_file(self, token_address, transactions):
+        """Write transactions to the token's disk cache file."""
         cache_path = self._get_cache_path(token_address)
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(transactions, f)
+            data = orjson.dumps(transactions)
+            with self._disk_lock:
+                self._evict_cache_files(cache_path, len(data))
+                with open(cache_path, 'wb') as f:
+                    f.write(data)
+                self._track_cache_file(cache_path, len(data))
         except Exception as e:
-            print(f"Error writing cache: {e}")
+            logger.warning("Error writing cache: %s", e)
+    
+    @classmethod
+    def _evict_cache_files(cls, cache_path, incoming_bytes):
+        """Remove the oldest cache files until incoming_bytes more fit under MAX_CACHE_SIZE_MB.
+        
+        Must be called with _disk_lock held.
+        """
+        if cls._disk_entries is None:
+            # Scan the directory once; later writes and removals keep the totals current
+            cls._disk_entries = {}
+            cls._disk_bytes = 0
+            with os.scandir(cls.CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        st = entry.stat()
+                        cls._disk_entries[entry.path] = (st.st_mtime, st.st_size)
+                        cls._disk_bytes += st.st_size
+        
+        # The file being rewritten no longer counts towards the total
+        cls._remove_cache_file(cache_path, unlink=False)
+        
+        limit = cls.MAX_CACHE_SIZE_MB * 1024 * 1024 - incoming_bytes
+        if cls._disk_bytes <= limit:
+            return
+        for path, _ in sorted(cls._disk_entries.items(), key=lambda item: item[1][0]):
+            cls._remove_cache_file(path)
+            if cls._disk_bytes <= limit:
+                break
+    
+    @classmethod
+    def _track_cache_file(cls, cache_path, size):
+        """Add a freshly written cache file to the size accounting.
+        
+        Must be called with _disk_lock held.
+        """
+        cls._disk_entries[cache_path] = (time.time(), size)
+        cls._disk_bytes += size
+    
+    @classmethod
+    def _remove_cache_file(cls, cache_path, unlink=True):
+        """Delete a cache file and drop it from the size accounting.
+        
+        Must be called with _disk_lock held.
+        """
+        if unlink:
+            try:
+                os.remove(cache_path)
+            except FileNotFoundError:
+                pass
+        if cls._disk_entries is not None:
+            _, size = cls._disk_entries.pop(cache_path, (0, 0))
+            cls._disk_bytes -= size
     
     @staticmethod
     def _get_tx_time(tx):
         """Get transaction timestamp in seconds."""
         tx_time = tx.get('timestamp', 0)
         if tx_time > 1600000000000:  # If timestamp is in milliseconds
-            tx_time = tx_time / 1000
+            # Whole seconds suffice: cutoffs are integers, so flooring never changes a comparison
+            tx_time = tx_time // 1000
         return tx_time
     
+    async def _fetch_page(self, session, base_url, before_tx, page, max_pages):
+        """Fetch one page of Helius transactions, or None on an error response."""
+        # Use optimized query parameters; aiohttp encodes them onto the URL
+        params = self._page_params
+        if before_tx:
+            params = {**params, 'before': before_tx}
+        
+        logger.debug("Fetching transactions from Helius API (page %d/%d)", page + 1, max_pages)
+        async with await self._get_with_retry(session, base_url, params) as response:
+            logger.debug("API Response Status: %s", response.status)
+            
+            if response.status != 200:
+                logger.error("Helius error response %s: %s", response.status, await response.text())
+                return None
+                
+            return await response.json(loads=orjson.loads)
+    
     async def fetch_transactions(self, token_address, minutes=5):
         """Fetch transactions from Helius API with caching and optimizations."""
         current_time = int(time.time())
         cutoff_time = current_time - (minutes * 60)
         
         # Check cache first
-        cached_txs = self._get_cached_transactions(token_address, cutoff_time)
+        cached_txs = await self._get_cached_transactions(token_address, cutoff_time)
         if cached_txs:
-            print("Using cached transactions")
+            logger.debug("Using cached transactions for %s", token_address)
             return cached_txs
         
-        base_url = f"https://api.helius.xyz/v0/addresses/{token_address}/transactions"
+        # Skip the page crawl for tokens that just came back empty
+        empty_until = self._negative_cache.get(token_address)
+        if empty_until is not None:
+            if time.time() < empty_until:
+                return []
+            del self._negative_cache[token_address]
+        
+        base_url = self.HELIUS_TX_URL.format(token_address)
+        session = await self._get_session()
         all_transactions = []
-        before_tx = None
         max_iterations = 20  # Increased from 10 to ensure we get enough history
         iteration = 0
-        found_cutoff = False
         oldest_tx_time = current_time
+        fetch_failed = False
         
-        while iteration < max_iterations and not found_cutoff:
-            # Use optimized query parameters
-            url = f"{base_url}?api-key={self.api_key}&commitment=finalized&maxVersion=0&limit=100"
-            if before_tx:
-                url += f"&before={before_tx}"
-            
-            print(f"Fetching transactions from Helius API (page {iteration + 1}/{max_iterations})")
-            response = requests.get(url)
-            print(f"API Response Status: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"Error response: {response.text}")
-                break
+        # Pages are chained by the `before` cursor, so only one is in flight at a time,
+        # but the next page is requested before the current one is filtered
+        next_page = asyncio.create_task(self._fetch_page(session, base_url, None, iteration, max_iterations))
+        try:
+            while next_page:
+                transactions = await next_page
+                next_page = None
+                if transactions is None:
+                    # Error response: the window's contents are unknown, not empty
+                    fetch_failed = True
+                    break
+                if not transactions:
+                    break
                 
-            transactions = response.json()
-            if not transactions:
-                break
-            
-            # Process each transaction
-            for tx in transactions:
-                tx_time = self._get_tx_time(tx)
-                oldest_tx_time = min(oldest_tx_time, tx_time)
-                if tx_time >= cutoff_time:
+                iteration += 1
+                # Normalize and compare the page's timestamps in one vectorized pass
+                # Whole seconds suffice: cutoff_time is an integer, so flooring never changes the comparison
+                timestamps = np.fromiter((tx.get('timestamp', 0) for tx in transactions),
+                                         dtype=np.int64, count=len(transactions))
+                is_millis = timestamps > 1600000000000  # Timestamps in milliseconds
+                timestamps = np.where(is_millis, timestamps // 1000, timestamps)
+                outside = np.flatnonzero(timestamps < cutoff_time)
+                
+                # The window continues past this page only if every transaction is inside it
+                if not outside.size and iteration < max_iterations:
+                    next_page = asyncio.create_task(self._fetch_page(
+                        session, base_url, transactions[-1].get('signature'), iteration, max_iterations
+                    ))
+                    # The filtering below never awaits, so yield once to let the task
+                    # claim its throttle slot and send the request before it runs
+                    await asyncio.sleep(0)
+                
+                # Keep transactions up to the first one outside the window, storing their
+                # timestamps normalized to whole seconds and their value, so analyses of
+                # cached lists don't walk the transfers again
+                kept = int(outside[0]) if outside.size else len(transactions)
+                oldest_tx_time = min(oldest_tx_time, int(timestamps[:kept + 1].min()))
+                for tx, tx_time in zip(transactions, timestamps[:kept].tolist()):
+                    tx['timestamp'] = tx_time
+                    tx['_value'] = self._get_transaction_value(tx, token_address)
                     all_transactions.append(tx)
-                else:
-                    found_cutoff = True
-                    break
-            
-            if found_cutoff:
-                break
-            
-            # Check if we've gone far enough back in time
-            if oldest_tx_time < cutoff_time:
-                break
-            
-            before_tx = transactions[-1].get('signature')
-            iteration += 1
-            
-            await asyncio.sleep(0.2)  # Rate limiting
+        finally:
+            if next_page:
+                next_page.cancel()
         
-        # Sort transactions by timestamp to ensure chronological order
-        all_transactions.sort(key=lambda x: self._get_tx_time(x))
+        # Helius pages are newest-first, so reversing yields chronological order;
+        # the sort then only verifies a single ascending run
+        all_transactions.reverse()
+        all_transactions.sort(key=itemgetter('timestamp'))
         
         # Cache the results
         if all_transactions:
-            self._cache_transactions(token_address, all_transactions)
-            time_range = f"from {datetime.fromtimestamp(oldest_tx_time)} to {datetime.fromtimestamp(current_time)}"
-            print(f"Fetched {len(all_transactions)} transactions {time_range}")
+            await self._cache_transactions(token_address, all_transactions)
+            logger.debug("Fetched %d transactions from ts=%d to ts=%d",
+                         len(all_transactions), oldest_tx_time, current_time)
+        elif not fetch_failed:
+            # Only a successful crawl that found nothing marks the token as quiet
+            self._negative_cache[token_address] = time.time() + self.NEGATIVE_CACHE_TTL
         
         return all_transactions
     
-    def _filter_transactions_by_time(self, transactions, minutes):
-        """Filter transactions within the specified time window."""
-        current_time = int(time.time())
-        cutoff_time = current_time - (minutes * 60)
+    async def _fetch_dexscreener(self, token_address):
+        """Get price, ticker and market cap for a token from DexScreener, or None if unavailable.
+        
+        Results are cached for DEX_CACHE_TTL so price and info lookups share one request.
+        """
+        entry = self._dex_cache.get(token_address)
+        if entry is not None and time.time() < entry[0]:
+            return entry[1]
+        
+        url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+        logger.debug("DexScreener API URL: %s", url)
+        
+        session = await self._get_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                logger.error("Error fetching token info: %s", response.status)
+                return None
+            data = await response.json(loads=orjson.loads)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DexScreener API Response: %s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         
-        # Debug timestamps
-        print(f"Current time: {datetime.fromtimestamp(current_time).strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Cutoff time: {datetime.fromtimestamp(cutoff_time).strftime('%Y-%m-%d %H:%M:%S')}")
+        pairs = data.get('pairs')
+        if not pairs:
+            logger.warning("No token data found for %s", token_address)
+            return None
         
-        filtered_txs = []
-        for tx in transactions:
-            tx_time = tx.get('timestamp', 0)
-            if tx_time > 1600000000000:  # If timestamp is in milliseconds
-                tx_time = tx_time / 1000
-            tx['timestamp'] = tx_time
-            if tx_time >= cutoff_time:
-                filtered_txs.append(tx)
+        # Read every field from the first Solana pair; without one, fall back to the
+        # first pair (usually the most liquid one) for ticker and market cap
+        solana_pair = next((pair for pair in pairs if pair.get('chainId') == 'solana'), None)
+        pair = solana_pair or pairs[0]
+        info = {
+            'price': float(solana_pair.get('priceUsd', 0)) if solana_pair else 0,
+            'ticker': pair['baseToken'].get('symbol', 'UNKNOWN'),
+            'market_cap_usd': float(pair.get('marketCap', 0))
+        }
         
-        return filtered_txs
+        self._dex_cache[token_address] = (time.time() + self.DEX_CACHE_TTL, info)
+        return info
     
-    def _get_token_price(self, token_address):
+    async def _get_token_price(self, token_address):
         """Get current token price in USD from DexScreener."""
         try:
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('pairs'):
-                    # Get the first Solana pair
-                    for pair in data['pairs']:
-                        if pair.get('chainId') == 'solana':
-                            return float(pair.get('priceUsd', 0))
-            return 0
-        except Exception as e:
-            print(f"Error fetching token price: {e}")
+            info = await self._fetch_dexscreener(token_address)
+            return info['price'] if info else 0
+        except Exception:
+            logger.exception("Error fetching token price for %s", token_address)
             return 0
 
+    def _extract_tx_features(self, tx, token_address):
+        """Collect every per-transfer signal of a transaction in one walk over its transfers."""
+        tget = tx.get
+        token_transfers = tget('tokenTransfers') or EMPTY
+        native_transfers = tget('nativeTransfers') or EMPTY
+        
+        token_amount = 0
+        first_token_amount = None
+        other_amount = 0
+        other_mint = None
+        is_flash_loan = False
+        # A flash loan needs the same mint to move twice, so a single transfer skips the check
+        check_flash = len(token_transfers) > 1
+        token_in_out = defaultdict(float)
+        for transfer in token_transfers:
+            mint = transfer.get('mint')
+            # Read signed rather than through _amt: flash-loan balances need the direction
+            value = transfer.get('tokenAmount')
+            raw_amount = float(value) if value else 0.0
+            if mint == token_address:
+                token_amount = abs(raw_amount)
+                if first_token_amount is None:
+                    first_token_amount = token_amount
+            else:
+                other_amount = abs(raw_amount)
+                other_mint = mint
+            
+            # Flash loan: a mint that flows in and back out within the transaction
+            if check_flash:
+                if mint in token_in_out and abs(token_in_out[mint] + raw_amount) < 0.01:
+                    is_flash_loan = True
+                    check_flash = False
+                else:
+                    token_in_out[mint] -= raw_amount
+        
+        # Convert lamports to SOL
+        sol_amount = sum(_amt(transfer, 'amount') for transfer in native_transfers) / 1e9
+        
+        return TxFeatures(
+            is_swap=tget('type') == 'SWAP',
+            transfer_count=len(token_transfers),
+            token_amount=token_amount,
+            first_token_amount=first_token_amount,
+            other_amount=other_amount,
+            other_mint=other_mint,
+            has_native=bool(native_transfers),
+            sol_amount=sol_amount,
+            is_flash_loan=is_flash_loan
+        )
+    
+    @staticmethod
+    def _value_from_features(features):
+        """Get the SOL or token value of a transaction from its extracted features."""
+        # Swaps and direct SOL transfers are valued in SOL when any moved
+        if (features.is_swap or features.has_native) and features.sol_amount > 0:
+            return features.sol_amount, True
+        if features.is_swap:
+            if features.other_amount > 0 and features.other_mint:
+                return features.token_amount, False
+        elif not features.has_native and features.first_token_amount is not None:
+            # Plain token transfer
+            return features.first_token_amount, False
+        return 0, False
+    
     def _get_transaction_value(self, tx, token_address):
         """Get the SOL or USD value from the transaction."""
-        amount = 0
-        is_sol_value = False
-        token_transfers = tx.get('tokenTransfers', [])
-        native_transfers = tx.get('nativeTransfers', [])
-
-        # Check if it's a swap
-        if tx.get('type') == 'SWAP':
-            token_amount = 0
-            sol_amount = 0
-            other_token_amount = 0
-            other_token_mint = None
-
-            # Get token amount
-            for transfer in token_transfers:
-                if transfer.get('mint') == token_address:
-                    token_amount = abs(float(transfer.get('tokenAmount', 0)))
-                else:
-                    other_token_amount = abs(float(transfer.get('tokenAmount', 0)))
-                    other_token_mint = transfer.get('mint')
-
-            # Check for SOL transfers
-            for transfer in native_transfers:
-                sol_amount += abs(float(transfer.get('amount', 0))) / 1e9  # Convert lamports to SOL
-
+        tget = tx.get
+        native_transfers = tget('nativeTransfers') or EMPTY
+        if native_transfers:
+            # Any SOL moved decides the value, so the token transfers need not be walked
+            sol_amount = sum(_amt(transfer, 'amount') for transfer in native_transfers) / 1e9
             if sol_amount > 0:
-                amount = sol_amount
-                is_sol_value = True
-            elif other_token_amount > 0 and other_token_mint:
-                # TODO: If needed, we could add USDC/USDT detection here
-                amount = token_amount
-                is_sol_value = False
-
-        # Check for direct SOL transfers
-        elif native_transfers:
-            total_sol = sum(abs(float(transfer.get('amount', 0))) for transfer in native_transfers) / 1e9
-            if total_sol > 0:
-                amount = total_sol
-                is_sol_value = True
-
-        # Check for token transfers
-        else:
-            for transfer in token_transfers:
-                if transfer.get('mint') == token_address:
-                    amount = abs(float(transfer.get('tokenAmount', 0)))
-                    break
+                return sol_amount, True
+        elif not tget('tokenTransfers'):
+            return 0, False
+        return self._value_from_features(self._extract_tx_features(tx, token_address))
 
-        return amount, is_sol_value
-
-    def _analyze_volume_patterns(self, tx, token_address, patterns, volume_by_type, volume_distribution):
-        """Analyze volume-related patterns in a transaction."""
-        amount, is_sol_value = self._get_transaction_value(tx, token_address)
+    def _process_tx(self, tx, token_address, amount, patterns, volume_by_type, last_price):
+        """Tally volume-by-type, price-impact and flash-loan patterns of a valued transaction.
         
+        last_price is the swap price of the previous transaction (or None). Returns
+        (is_flash_loan, is_high_slippage, last_price) with the price updated for the next call.
+        """
+        is_swap = tx.get('type') == 'SWAP'
         if amount > 0:
             # Track volume by type
-            tx_type = tx.get('type', '')
-            if tx_type == 'SWAP':
-                volume_by_type['swaps']['amount'] += amount
-                volume_by_type['swaps']['count'] += 1
+            if is_swap:
+                _tally(volume_by_type['swaps'], amount)
             elif 'transfer' in tx.get('description', '').lower():
-                volume_by_type['transfers']['amount'] += amount
-                volume_by_type['transfers']['count'] += 1
-            
-            # Track volume distribution based on SOL value
-            if is_sol_value:
-                if amount < 0.1:  # < 0.1 SOL
-                    volume_distribution['very_small']['count'] += 1
-                    volume_distribution['very_small']['amount'] += amount
-                elif amount < 1:  # 0.1 - 1 SOL
-                    volume_distribution['small']['count'] += 1
-                    volume_distribution['small']['amount'] += amount
-                elif amount < 10:  # 1 - 10 SOL
-                    volume_distribution['medium']['count'] += 1
-                    volume_distribution['medium']['amount'] += amount
-                elif amount < 100:  # 10 - 100 SOL
-                    volume_distribution['large']['count'] += 1
-                    volume_distribution['large']['amount'] += amount
-                else:  # > 100 SOL
-                    volume_distribution['very_large']['count'] += 1
-                    volume_distribution['very_large']['amount'] += amount
-            else:
-                # Fallback to token amounts if no SOL value
-                if amount < 100:
-                    volume_distribution['very_small']['count'] += 1
-                    volume_distribution['very_small']['amount'] += amount
-                elif amount < 1000:
-                    volume_distribution['small']['count'] += 1
-                    volume_distribution['small']['amount'] += amount
-                elif amount < 10000:
-                    volume_distribution['medium']['count'] += 1
-                    volume_distribution['medium']['amount'] += amount
-                elif amount < 100000:
-                    volume_distribution['large']['count'] += 1
-                    volume_distribution['large']['amount'] += amount
-                else:
-                    volume_distribution['very_large']['count'] += 1
-                    volume_distribution['very_large']['amount'] += amount
+                _tally(volume_by_type['transfers'], amount)
         
-        return amount, is_sol_value
-
-    def _analyze_price_impact(self, tx, token_address, price_points, volume_by_type, patterns, amount):
-        """Analyze price impact and slippage."""
-        if tx.get('type', '') == 'SWAP' and len(tx.get('tokenTransfers', [])) >= 2:
-            try:
-                token_amount = None
-                other_amount = None
-                for transfer in tx.get('tokenTransfers', []):
-                    if transfer.get('mint') == token_address:
-                        token_amount = abs(float(transfer.get('tokenAmount', 0)))
-                    else:
-                        other_amount = abs(float(transfer.get('tokenAmount', 0)))
+        # Price impact and flash loans both need at least two token transfers,
+        # so other transactions skip the transfer walk
+        is_flash_loan = is_high_slippage = False
+        if len(tx.get('tokenTransfers') or EMPTY) >= 2:
+            features = self._extract_tx_features(tx, token_address)
+            
+            # Price impact against the previous swap; only the last price is needed
+            if is_swap and features.token_amount and features.other_amount:
+                price = features.other_amount / features.token_amount
+                
+                # Check for high slippage
+                if last_price is not None:
+                    price_impact = abs(price - last_price) / last_price
+                    if price_impact > 0.05:  # 5% slippage
+                        is_high_slippage = True
+                        _tally(patterns['high_slippage'], amount)
+                        _tally(volume_by_type['high_slippage'], amount)
                 
-                if token_amount and other_amount and token_amount > 0:
-                    price = other_amount / token_amount
-                    price_points.append((tx['timestamp'], price))
-                    
-                    # Check for high slippage
-                    if len(price_points) > 1:
-                        prev_price = price_points[-2][1]
-                        price_impact = abs(price - prev_price) / prev_price
-                        if price_impact > 0.05:  # 5% slippage
-                            patterns['high_slippage']['count'] += 1
-                            patterns['high_slippage']['amount'] += amount
-                            volume_by_type['high_slippage']['amount'] += amount
-                            volume_by_type['high_slippage']['count'] += 1
-            except Exception as e:
-                print(f"Error calculating price: {str(e)}")
+                last_price = price
+            
+            if features.is_flash_loan:
+                is_flash_loan = True
+                _tally(patterns['flash_loans'], amount)
+                _tally(volume_by_type['flash_loans'], amount)
+        
+        return is_flash_loan, is_high_slippage, last_price
     
-    def _detect_flash_loans(self, tx, token_transfers, patterns, volume_by_type, amount):
-        """Detect flash loan patterns."""
-        token_in_out = {}
-        for transfer in token_transfers:
-            mint = transfer.get('mint')
-            amt = float(transfer.get('tokenAmount', 0))
-            if mint in token_in_out and abs(token_in_out[mint] + amt) < 0.01:
-                patterns['flash_loans']['count'] += 1
-                patterns['flash_loans']['amount'] += amount
-                volume_by_type['flash_loans']['amount'] += amount
-                volume_by_type['flash_loans']['count'] += 1
-                break
-            token_in_out[mint] = token_in_out.get(mint, 0) - amt
+    @staticmethod
+    def _is_buy(tx, token_address, wallet):
+        """Whether the wallet received the tracked token in this transaction."""
+        return any(
+            transfer.get('mint') == token_address and transfer.get('toUserAccount') == wallet
+            for transfer in tx.get('tokenTransfers') or EMPTY
+        )
+    
+    def _summarize_categories(self, wallet_history, wallet_categories):
+        """Aggregate wallet count, volume and buy/sell volume per trader category."""
+        trader_categories = {
+            category: {'count': 0, 'volume': 0.0, 'buys': 0.0, 'sells': 0.0, 'transactions': []}
+            for category in self.TRADER_CATEGORIES
+        }
+        for wallet, history in wallet_history.items():
+            data = trader_categories[wallet_categories[wallet]]
+            data['count'] += 1
+            for trade in history:
+                amount = trade['amount']
+                data['volume'] += amount
+                if trade['is_buy']:
+                    data['buys'] += amount
+                else:
+                    data['sells'] += amount
+            data['transactions'].extend(history)
+        return trader_categories
+    
+    def _volume_distribution(self, volumes, sol_value_flags):
+        """Bucket transaction volumes into VOLUME_BUCKETS with vectorized NumPy ops."""
+        amounts = np.asarray(volumes, dtype=np.float64)
+        is_sol = np.asarray(sol_value_flags, dtype=bool)
+        
+        # Each bound is exclusive ('<'): SOL thresholds for SOL values, token thresholds otherwise
+        bucket_idx = np.where(
+            is_sol,
+            np.digitize(amounts, self.SOL_VOLUME_THRESHOLDS),
+            np.digitize(amounts, self.TOKEN_VOLUME_THRESHOLDS)
+        )
+        
+        # Zero-value transactions are not counted
+        traded = amounts > 0
+        bucket_idx = bucket_idx[traded]
+        amounts = amounts[traded]
+        n_buckets = len(self.VOLUME_BUCKETS)
+        counts = np.bincount(bucket_idx, minlength=n_buckets)
+        sums = np.bincount(bucket_idx, weights=amounts, minlength=n_buckets)
+        
+        return {
+            name: {'count': int(count), 'amount': float(amount)}
+            for name, count, amount in zip(self.VOLUME_BUCKETS, counts, sums)
+        }
     
     def _categorize_trader(self, tx_history):
         """Categorize trader based on their transaction history."""
-        total_volume = sum(tx['amount'] for tx in tx_history)
+        # Gather volume, time span and pattern counts in a single pass over the history
+        total_volume = 0
+        first_ts = last_ts = None
+        rapid_trades = flash_loans = high_slippage = large_trades = 0
+        for tx in tx_history:
+            amount = tx['amount']
+            timestamp = tx['timestamp']
+            total_volume += amount
+            if first_ts is None or timestamp < first_ts:
+                first_ts = timestamp
+            if last_ts is None or timestamp > last_ts:
+                last_ts = timestamp
+            if tx.get('is_rapid', False):
+                rapid_trades += 1
+            if tx.get('is_flash_loan', False):
+                flash_loans += 1
+            if tx.get('is_high_slippage', False):
+                high_slippage += 1
+            if amount > 10:  # >10 SOL
+                large_trades += 1
+
         avg_time_between_trades = 0
         if len(tx_history) > 1:
-            times = [tx['timestamp'] for tx in tx_history]
-            times.sort()
-            time_diffs = [times[i+1] - times[i] for i in range(len(times)-1)]
-            avg_time_between_trades = sum(time_diffs) / len(time_diffs)
-
-        # Count specific patterns
-        rapid_trades = sum(1 for tx in tx_history if tx.get('is_rapid', False))
-        flash_loans = sum(1 for tx in tx_history if tx.get('is_flash_loan', False))
-        high_slippage = sum(1 for tx in tx_history if tx.get('is_high_slippage', False))
-        large_trades = sum(1 for tx in tx_history if tx['amount'] > 10)  # >10 SOL
+            # The sorted gaps telescope, so their mean only needs the first and last timestamps
+            avg_time_between_trades = (last_ts - first_ts) / (len(tx_history) - 1)
 
         # Market Maker characteristics
         if len(tx_history) > 50 and avg_time_between_trades < 60:
@@ -366,108 +659,138 @@ class TransactionAnalyzer:
         # Default to retail
         return "retail"
 
-    async def analyze_transactions(self, token_address, minutes=5):
-        """Analyze transactions for a token over the specified time window."""
+    async def analyze_transactions(self, token_address, minutes=5, keep_raw=False):
+        """Analyze transactions for a token over the specified time window.
+        
+        Processed transactions only carry the full Helius payload as raw_transaction when keep_raw is set.
+        """
         try:
             transactions = await self.fetch_transactions(token_address, minutes)
             if not transactions:
-                print("No transactions found")
+                logger.info("No transactions found for %s", token_address)
                 return None
                 
             # Get token info from DexScreener
-            token_info = self._get_token_price(token_address)
+            token_info = await self._get_token_price(token_address)
             if not token_info:
-                print("Failed to fetch token info")
+                logger.warning("Failed to fetch token info for %s", token_address)
                 return None
                 
-            # Process transactions
-            active_wallets = set()
-            total_volume = 0
+            # Process transactions; each wallet's trades are kept for trader categorization
+            wallet_history = {}
+            patterns = _counters('high_slippage', 'flash_loans')
+            volume_by_type = _counters('swaps', 'transfers', 'high_slippage', 'flash_loans')
+            last_price = None
             
-            # Process each transaction
+            # Process each transaction, collecting volumes for the totals below; transactions
+            # are chronological, so each swap's price impact is measured against the swap before it
             processed_txs = []
+            volumes = []
+            sol_value_flags = []
             for tx in transactions:
+                tget = tx.get
                 tx_time = self._get_tx_time(tx)
-                wallet = tx.get('feePayer', 'unknown')  # Use feePayer as the wallet address
-                volume = self._get_transaction_value(tx, token_address)[0]
+                # Use feePayer as the wallet address; interned so repeat wallets share one
+                # string object and dict lookups match on identity
+                wallet = sys.intern(tget('feePayer') or 'unknown')
+                value = tget('_value')
+                volume, is_sol_value = value if value is not None else self._get_transaction_value(tx, token_address)
+                volumes.append(volume)
+                sol_value_flags.append(is_sol_value)
+                is_flash_loan, is_high_slippage, last_price = self._process_tx(
+                    tx, token_address, volume, patterns, volume_by_type, last_price
+                )
                 
-                active_wallets.add(wallet)
-                total_volume += volume
+                # Transactions are chronological, so the wallet's previous trade is the last one kept
+                history = wallet_history.get(wallet)
+                if history is None:
+                    history = wallet_history[wallet] = []
+                history.append({
+                    'wallet': wallet,
+                    'timestamp': tx_time,
+                    'amount': volume,
+                    'is_buy': self._is_buy(tx, token_address, wallet),
+                    'is_rapid': bool(history) and tx_time - history[-1]['timestamp'] < self.RAPID_TRADE_SECONDS,
+                    'is_flash_loan': is_flash_loan,
+                    'is_high_slippage': is_high_slippage
+                })
                 
                 processed_txs.append({
                     'timestamp': tx_time,
                     'wallet': wallet,
                     'volume': volume,
-                    'signature': tx.get('signature'),
-                    'type': tx.get('type'),
-                    'raw_transaction': tx
+                    'signature': tget('signature'),
+                    'type': tget('type'),
+                    'is_flash_loan': is_flash_loan,
+                    'is_high_slippage': is_high_slippage,
+                    'raw_transaction': tx if keep_raw else None
                 })
                 
+            wallet_categories = {
+                wallet: self._categorize_trader(history) for wallet, history in wallet_history.items()
+            }
+            
             # Calculate metrics
             metrics = {
                 'transactions': processed_txs,
                 'transaction_count': len(transactions),
-                'active_wallets': len(active_wallets),
+                'active_wallets': len(wallet_history),
                 'trading_velocity': len(transactions) / (minutes * 60),  # transactions per second
-                'total_volume': total_volume,
+                'total_volume': math.fsum(volumes),
+                'volume_distribution': self._volume_distribution(volumes, sol_value_flags),
+                'volume_by_type': volume_by_type,
+                'patterns': patterns,
                 'token_ticker': token_info,
-                'market_cap_usd': 0
+                'market_cap_usd': 0,
+                'wallet_categories': wallet_categories,
+                'trader_categories': self._summarize_categories(wallet_history, wallet_categories),
+                # Most active wallets; only the top 5 are kept, so no full sort is needed
+                'suspicious_wallets': {
+                    wallet: len(history)
+                    for wallet, history in nlargest(5, wallet_history.items(), key=lambda item: len(item[1]))
+                }
             }
             
             return metrics
             
-        except Exception as e:
-            print(f"Error analyzing transactions: {str(e)}")
+        except Exception:
+            logger.exception("Error analyzing transactions for %s", token_address)
             return None
 
+    async def analyze_many(self, token_addresses, minutes=5):
+        """Analyze several tokens concurrently, returning {token_address: analysis}."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ANALYSES)
+        
+        async def analyze_one(token_address):
+            async with semaphore:
+                return token_address, await self.analyze_transactions(token_address, minutes)
+        
+        return dict(await asyncio.gather(*map(analyze_one, token_addresses)))
+
     async def get_token_info(self):
         """Get token ticker and market cap information from DexScreener API."""
         token_address = os.getenv('TOKEN_ADDRESS')
         if not token_address:
-            print("TOKEN_ADDRESS environment variable not set")
+            logger.error("TOKEN_ADDRESS environment variable not set")
             return {'ticker': 'UNKNOWN', 'market_cap_usd': 0.0}
             
-        print(f"\nFetching token info from DexScreener for {token_address}")
-            
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        logger.debug("Fetching token info from DexScreener for %s", token_address)
             
         try:
-            # DexScreener API endpoint
-            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            print(f"DexScreener API URL: {url}")
+            info = await self._fetch_dexscreener(token_address)
+            if not info:
+                return {'ticker': 'UNKNOWN', 'market_cap_usd': 0.0}
             
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    print(f"Error fetching token info: {response.status}")
-                    return {'ticker': 'UNKNOWN', 'market_cap_usd': 0.0}
-                    
-                data = await response.json()
-                print(f"DexScreener API Response: {json.dumps(data, indent=2)}")
-                
-                if not data.get('pairs') or len(data['pairs']) == 0:
-                    print("No token data found")
-                    return {'ticker': 'UNKNOWN', 'market_cap_usd': 0.0}
-                    
-                # Get the first pair (usually the most liquid one)
-                pair = data['pairs'][0]
-                
-                # Extract token info
-                base_token = pair['baseToken']
-                ticker = base_token.get('symbol', 'UNKNOWN')
-                
-                # Get market cap directly from the pair data
-                market_cap_usd = float(pair.get('marketCap', 0))
-                
-                print(f"\nToken Info from DexScreener:")
-                print(f"• Ticker: {ticker}")
-                print(f"• Market Cap: ${market_cap_usd:,.2f}")
-                
-                return {
-                    'ticker': ticker,
-                    'market_cap_usd': market_cap_usd
-                }
+            ticker = info['ticker']
+            market_cap_usd = info['market_cap_usd']
+            
+            logger.info("Token info from DexScreener: ticker %s, market cap $%.2f", ticker, market_cap_usd)
+            
+            return {
+                'ticker': ticker,
+                'market_cap_usd': market_cap_usd
+            }
                 
-        except Exception as e:
-            print(f"Error fetching token info: {str(e)}")
+        except Exception:
+            logger.exception("Error fetching token info")
             return {'ticker': 'UNKNOWN', 'market_cap_usd': 0.0}